@@ -3,12 +3,14 @@ import streamlit as st
 # Must be the first Streamlit command
 st.set_page_config(page_title="AI Paper Search", page_icon="📚", layout="wide")
 
-import json
+import html
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
-from src.search.ai_query import PaperSearchRunner
+import orjson
+
+from src.search.ai_query import PaperSearchRunner, PaperSemanticSearch
 
 # Initialize session state
 if "search_results" not in st.session_state:
@@ -21,6 +23,8 @@ if "current_progress" not in st.session_state:
     st.session_state.current_progress = 0
 if "loaded_papers" not in st.session_state:
     st.session_state.loaded_papers = None
+if "loaded_key" not in st.session_state:
+    st.session_state.loaded_key = None
 
 # Constants
 CONFERENCES = ["ccs", "ndss", "sp", "uss"]
@@ -28,14 +32,14 @@ YEARS = [str(year) for year in range(2015, 2025)]
 DATA_DIR = Path(__file__).parent / "data"
 
 
+@st.cache_data(max_entries=64)
 def load_papers(conference: str, year: str) -> list[dict[str, Any]]:
     """Load papers from the enriched data directory"""
     file_path = DATA_DIR / "enriched" / conference / f"{year}.json"
     if not file_path.exists():
         return []
 
-    with open(file_path) as f:
-        papers = json.load(f)
+    papers = orjson.loads(file_path.read_bytes())
     return [
         p
         for p in papers
@@ -43,7 +47,39 @@ def load_papers(conference: str, year: str) -> list[dict[str, Any]]:
     ]
 
 
-def display_papers(papers: list[dict[str, Any]], show_conference: bool = True):
+def _get_keywords(paper: dict[str, Any]) -> list[str]:
+    """Get keywords from either a search result or a loaded paper"""
+    keywords = paper.get("keywords", paper.get("info", {}).get("keywords"))
+    if isinstance(keywords, str):
+        return [keywords]
+    return keywords or []
+
+
+@st.cache_data(max_entries=64)
+def build_keyword_index(
+    key: tuple[str | None, ...],
+    _papers: list[dict[str, Any]],
+) -> tuple[list[str], dict[str, list[int]]]:
+    """
+    Build the sorted keyword list and a keyword -> paper indices index
+
+    Args:
+        key: Identifies the paper list, e.g. its conference and year
+        _papers: Papers of that list, left out of the cache key since
+            hashing them costs as much as building the index
+    """
+    index: dict[str, list[int]] = {}
+    for i, paper in enumerate(_papers):
+        for keyword in dict.fromkeys(_get_keywords(paper)):
+            index.setdefault(keyword, []).append(i)
+    return sorted(index), index
+
+
+def display_papers(
+    papers: list[dict[str, Any]],
+    index_key: tuple[str | None, ...],
+    show_conference: bool = True,
+):
     """Display papers in a nice format"""
     if not papers:
         return
@@ -56,34 +92,12 @@ def display_papers(papers: list[dict[str, Any]], show_conference: bool = True):
     papers_to_display = papers
 
     # Add keyword filter
-    all_keywords = set()
-    for paper in papers_to_display:
-        # Handle both search results and loaded papers
-        keywords = paper.get(
-            "keywords", paper.get("info", {}).get("keywords", [])
-        )
-        if isinstance(keywords, str):
-            keywords = [keywords]
-        all_keywords.update(keywords)
-
-    selected_keyword = st.selectbox(
-        "Filter by keyword", ["All"] + sorted(list(all_keywords))
-    )
+    all_keywords, keyword_index = build_keyword_index(index_key, papers)
+    selected_keyword = st.selectbox("Filter by keyword", ["All"] + all_keywords)
 
     # Filter papers by keyword if selected
     if selected_keyword != "All":
-        papers_to_display = [
-            p
-            for p in papers_to_display
-            if selected_keyword
-            in (
-                [p.get("keywords", p.get("info", {}).get("keywords"))]
-                if isinstance(
-                    p.get("keywords", p.get("info", {}).get("keywords")), str
-                )
-                else p.get("keywords", p.get("info", {}).get("keywords", []))
-            )
-        ]
+        papers_to_display = [papers[i] for i in keyword_index[selected_keyword]]
 
     # Display papers
     for paper in papers_to_display:
@@ -94,69 +108,103 @@ def display_papers(papers: list[dict[str, Any]], show_conference: bool = True):
             title = " ".join(title)
 
         with st.expander(f"📄 {title}"):
-            # Display title inside
-            st.markdown(f"### {title}")
+            # Render the whole card as one markdown element, every field
+            # is escaped since abstracts are scraped from third-party sites
+            st.markdown(
+                _render_paper(paper, info, title, show_conference),
+                unsafe_allow_html=True,
+            )
+
 
-            if show_conference:
-                st.write(
-                    f"**Conference:** {paper.get('conf', 'N/A')} {paper.get('year', 'N/A')}"
+def _render_paper(
+    paper: dict[str, Any],
+    info: dict[str, Any],
+    title: str,
+    show_conference: bool,
+) -> str:
+    """Build the markdown body shown inside a paper's expander"""
+    sections = [f"### {html.escape(str(title))}"]
+
+    if show_conference:
+        conf = html.escape(str(paper.get("conf", "N/A")))
+        year = html.escape(str(paper.get("year", "N/A")))
+        sections.append(f"**Conference:** {conf} {year}")
+
+    # Authors
+    authors = info.get("authors", {}).get("author", [])
+    if authors:
+        if isinstance(authors, dict):
+            authors = [authors]
+        sections.append(
+            "**Authors:** "
+            + ", ".join(
+                html.escape(
+                    author.get("text") or author.get("@pid") or "Unknown"
                 )
+                for author in authors
+            )
+        )
 
-            # Authors
-            authors = info.get("authors", {}).get("author", [])
-            if authors:
-                if isinstance(authors, dict):
-                    authors = [authors]
-                author_names = [
-                    author.get("text", author.get("@pid", "Unknown"))
-                    for author in authors
-                ]
-                st.write("**Authors:** " + ", ".join(author_names))
-
-            # Abstract
-            abstract = info.get("abstract", paper.get("abstract", "N/A"))
-            if isinstance(abstract, list):
-                abstract = " ".join(abstract)
-            st.write(f"**Abstract:** {abstract}")
-
-            # Keywords and metadata
-            keywords = info.get("keywords", paper.get("keywords", []))
-            if keywords:
-                if isinstance(keywords, str):
-                    keywords = [keywords]
-                st.write("**Keywords:**")
-                cols = st.columns(
-                    min(len(keywords), 4)
-                )  # Limit to 4 columns max
-                for idx, keyword in enumerate(keywords):
-                    with cols[idx % 4]:
-                        st.markdown(
-                            f"<span style='background-color: #f0f2f6; padding: 2px 6px; margin: 0 4px; border-radius: 4px;'>{keyword}</span>",
-                            unsafe_allow_html=True,
-                        )
-
-            # Paper link
-            if "url" in paper:
-                url = paper["url"]
-            elif "ee" in info:
-                url = info["ee"]
-                if isinstance(url, list):
-                    url = url[0]
-            else:
-                url = None
+    # Abstract
+    abstract = info.get("abstract", paper.get("abstract", "N/A"))
+    if isinstance(abstract, list):
+        abstract = " ".join(abstract)
+    sections.append(f"**Abstract:** {html.escape(str(abstract))}")
+
+    # Keywords, wrapped as inline pills
+    keywords = _get_keywords(paper)
+    if keywords:
+        pills = "".join(
+            f"<span style='background-color: #f0f2f6; padding: 2px 6px; border-radius: 4px;'>{html.escape(keyword)}</span>"
+            for keyword in keywords
+        )
+        sections.append(
+            "**Keywords:**\n\n"
+            f"<div style='display: flex; flex-wrap: wrap; gap: 4px 8px;'>{pills}</div>"
+        )
 
-            if url:
-                st.markdown(f"[📄 View Paper]({url})")
+    # Paper link
+    if "url" in paper:
+        url = paper["url"]
+    elif "ee" in info:
+        url = info["ee"]
+        if isinstance(url, list):
+            url = url[0]
+    else:
+        url = None
 
+    # Only link web pages, a javascript: URL would run on click
+    if url and str(url).startswith(("http://", "https://")):
+        sections.append(
+            f"<a href='{html.escape(url)}' target='_blank'>📄 View Paper</a>"
+        )
 
-def search_papers(query: str, conference: str = None, year: str = None):
-    """Search papers using AI query with progress tracking"""
+    return "\n\n".join(sections)
+
+
+@st.cache_resource
+def get_searcher() -> PaperSemanticSearch:
+    """Load the search engine and its dataset once per server process"""
+    return PaperSemanticSearch(max_workers=10)
+
+
+@st.cache_data(ttl=3600)
+def run_search(
+    query: str, conference: str | None, year: str | None
+) -> list[dict[str, Any]]:
+    """Run an AI search, identical queries are served from the cache"""
     ai_query = PaperSearchRunner(
         query=query,
         conference=conference,
         years=year,
+        searcher=get_searcher(),
     )
-    results = ai_query.run()
+    return ai_query.run()
+
+
+def search_papers(query: str, conference: str = None, year: str = None):
+    """Search papers using AI query with progress tracking"""
+    results = run_search(query, conference, year)
 
     # Reset progress
     st.session_state.current_progress = 0
@@ -197,12 +245,21 @@ with tab1:
             papers = load_papers(conference, year)
             if papers:
                 st.session_state.loaded_papers = papers
+                st.session_state.loaded_key = ("browse", conference, year)
                 st.success(f"Found {len(papers)} papers")
-                display_papers(papers, show_conference=False)
+                display_papers(
+                    papers,
+                    st.session_state.loaded_key,
+                    show_conference=False,
+                )
             else:
                 st.info(f"No papers found for {conference} {year}")
     elif st.session_state.loaded_papers:
-        display_papers(st.session_state.loaded_papers, show_conference=False)
+        display_papers(
+            st.session_state.loaded_papers,
+            st.session_state.loaded_key,
+            show_conference=False,
+        )
 
 with tab2:
     st.header("AI-Powered Search")
@@ -253,7 +310,14 @@ with tab2:
                     status_text.empty()
 
                     st.success(f"Found {len(results)} relevant papers")
-                    display_papers(results)
+                    # Cached results may change once run_search expires, so
+                    # the index of each search run is keyed by its time
+                    searched_at = st.session_state.search_history[-1][
+                        "timestamp"
+                    ]
+                    display_papers(
+                        results, ("search", query, conf, year, searched_at)
+                    )
                 else:
                     st.session_state.search_results = None
                     progress_bar.progress(100)
@@ -1,33 +1,44 @@
 import argparse
+import asyncio
 import json
 import os
 from pathlib import Path
 from typing import Any
 
-from notion_client import Client
+from notion_client import APIErrorCode, APIResponseError, AsyncClient
 from rich.console import Console
 
 console = Console()
 
+# Notion allows ~3 requests/s on average, bursts above that get a 429
+MAX_CONCURRENT_REQUESTS = 5
+
 
 class NotionClient:
     """A class to handle Notion database operations for academic papers."""
 
-    def __init__(self, database_id: str):
+    # Notion rejects rich_text content longer than 2000 characters
+    MAX_TEXT_LENGTH = 2000
+
+    def __init__(
+        self, database_id: str, max_concurrency: int = MAX_CONCURRENT_REQUESTS
+    ):
         """Initialize the Notion client.
 
         Args:
             database_id: The ID of the target Notion database
+            max_concurrency: Maximum number of in-flight page creations
         """
         self.database_id = database_id
+        self.max_concurrency = max_concurrency
         self.client = self._create_client()
 
-    def _create_client(self) -> Client:
-        """Create and return a Notion client instance."""
+    def _create_client(self) -> AsyncClient:
+        """Create and return an async Notion client instance."""
         token = os.environ.get("NOTION_TOKEN")
         if not token:
             raise ValueError("NOTION_TOKEN environment variable is not set")
-        return Client(auth=token)
+        return AsyncClient(auth=token)
 
     def _truncate_text(self, text: str | None, max_length: int) -> str:
         """Truncate text to max_length and add ellipsis if needed."""
@@ -43,11 +54,14 @@ class NotionClient:
             return ""
         return ", ".join(authors)
 
-    def add_paper(self, paper: dict[str, Any]) -> None:
+    async def add_paper(
+        self, paper: dict[str, Any], max_retries: int = 5
+    ) -> None:
         """Add a single paper to the Notion database.
 
         Args:
             paper: Dictionary containing paper information
+            max_retries: Maximum number of attempts when rate limited
         """
         # Prepare properties for Notion page
         properties = {
@@ -57,7 +71,7 @@ class NotionClient:
                     {
                         "text": {
                             "content": self._truncate_text(
-                                paper.get("abstract"), 2000
+                                paper.get("abstract"), self.MAX_TEXT_LENGTH
                             )
                         }
                     }
@@ -78,18 +92,41 @@ class NotionClient:
             "properties": properties,
         }
 
-        try:
-            self.client.pages.create(**page_data)
-            console.print(
-                f"✅ Added paper: {paper.get('title')}", style="green"
-            )
-        except Exception as e:
-            console.print(
-                f"❌ Error adding paper '{paper.get('title')}': {str(e)}",
-                style="red",
-            )
-
-    def import_papers(self, dir_path: str | Path, file_pattern: str) -> None:
+        for attempt in range(max_retries):
+            try:
+                await self.client.pages.create(**page_data)
+                console.print(
+                    f"✅ Added paper: {paper.get('title')}", style="green"
+                )
+                return
+            except Exception as e:
+                if (
+                    isinstance(e, APIResponseError)
+                    and e.code == APIErrorCode.RateLimited
+                    and attempt < max_retries - 1
+                ):
+                    # Honor Notion's Retry-After, fall back to exponential
+                    retry_after = float(
+                        e.headers.get("Retry-After", 2**attempt)
+                    )
+                    await asyncio.sleep(retry_after)
+                    continue
+                console.print(
+                    f"❌ Error adding paper '{paper.get('title')}': {str(e)}",
+                    style="red",
+                )
+                return
+
+    async def _add_paper_bounded(
+        self, semaphore: asyncio.Semaphore, paper: dict[str, Any]
+    ) -> None:
+        """Add a paper while holding a slot of the concurrency limit."""
+        async with semaphore:
+            await self.add_paper(paper)
+
+    async def import_papers(
+        self, dir_path: str | Path, file_pattern: str
+    ) -> None:
         """Import papers from JSONL files in directory matching the pattern.
 
         Args:
@@ -115,6 +152,8 @@ class NotionClient:
             style="blue",
         )
 
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
         # Process each matching file
         for file_idx, jsonl_file in enumerate(matching_files, 1):
             console.print(
@@ -136,12 +175,13 @@ class NotionClient:
                     style="blue",
                 )
 
-                # Import papers with progress tracking
-                for paper_idx, paper in enumerate(papers, 1):
-                    console.print(
-                        f"Processing paper {paper_idx}/{total} from {jsonl_file.name}"
+                # Import papers concurrently, bounded by the semaphore
+                await asyncio.gather(
+                    *(
+                        self._add_paper_bounded(semaphore, paper)
+                        for paper in papers
                     )
-                    self.add_paper(paper)
+                )
 
             except Exception as e:
                 console.print(
@@ -172,7 +212,14 @@ def main():
     args = parser.parse_args()
 
     notion = NotionClient(database_id=args.database_id)
-    notion.import_papers(args.input_dir, args.file_pattern)
+
+    async def run() -> None:
+        try:
+            await notion.import_papers(args.input_dir, args.file_pattern)
+        finally:
+            await notion.client.aclose()
+
+    asyncio.run(run())
 
 
 if __name__ == "__main__":
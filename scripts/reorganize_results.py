@@ -1,17 +1,25 @@
-import hashlib
 import json
+import sys
 import time
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
+
+import orjson
+
+sys.path.append(".")
+
+from src.search.ai_query import PaperSemanticSearch  # noqa: E402
 
 
 def create_hash_dir(query: str, base_dir: str) -> tuple[Path, dict[str, Any]]:
     """Create hash-based directory and metadata for the query"""
-    # Create hash of query for directory name
-    cache_key = hashlib.md5(query.encode()).hexdigest()
-
-    # Create output directory
-    output_dir = Path(base_dir) / cache_key
+    # Use the directory names of ai_query, moving one created under the
+    # old MD5 name so earlier output is kept
+    output_dir = Path(base_dir) / PaperSemanticSearch._hash_key(query)
+    PaperSemanticSearch._migrate_legacy_path(
+        Path(base_dir) / PaperSemanticSearch._legacy_hash_key(query),
+        output_dir,
+    )
     output_dir.mkdir(parents=True, exist_ok=True)
 
     # Create metadata
@@ -28,9 +36,17 @@ def create_hash_dir(query: str, base_dir: str) -> tuple[Path, dict[str, Any]]:
 
 
 def save_results(
-    results: list[dict[str, Any]], output_dir: Path, conference: str, year: str
+    results: list[dict[str, Any]],
+    output_dir: Path,
+    conference: str,
+    year: str,
+    concat_file: BinaryIO | None = None,
 ) -> Path:
-    """Save results to appropriate files"""
+    """Save results to appropriate files
+
+    If concat_file is given, every record is also appended to it so the
+    combined results don't have to be re-read from the per-year files.
+    """
     if not results:
         return None
 
@@ -39,25 +55,16 @@ def save_results(
     output_path = output_dir / filename
 
     # Save results to jsonl
-    with open(output_path, "w") as f:
+    with open(output_path, "wb") as f:
         for paper in results:
-            f.write(json.dumps(paper) + "\n")
+            line = orjson.dumps(paper) + b"\n"
+            f.write(line)
+            if concat_file is not None:
+                concat_file.write(line)
 
     return output_path
 
 
-def concat_results(output_dir: Path) -> Path:
-    """Concatenate all results into a single file"""
-    concat_path = output_dir / "all_results.jsonl"
-    with open(concat_path, "w") as outfile:
-        for file_path in output_dir.glob("*.jsonl"):
-            if file_path != concat_path:  # Skip the concat file itself
-                with open(file_path) as infile:
-                    for line in infile:
-                        outfile.write(line)
-    return concat_path
-
-
 def main():
     # Define paths
     old_base_dir = Path("data/output")
@@ -73,30 +80,32 @@ def main():
     conferences = ["ccs", "ndss", "sp", "uss"]
     years = range(2015, 2025)
 
-    for conf in conferences:
-        for year in years:
-            old_file = (
-                old_base_dir
-                / conf
-                / str(year)
-                / "papers_on_detecting_access_control_vulnerabilities.jsonl"
-            )
-
-            if old_file.exists() and old_file.stat().st_size > 0:
-                # Read papers from old file
-                papers = []
-                with open(old_file) as f:
-                    for line in f:
-                        if line.strip():  # Skip empty lines
-                            papers.append(json.loads(line))
-
-                if papers:
-                    # Save to new location
-                    save_results(papers, output_dir, conf, str(year))
-                    print(f"Processed {conf} {year}: {len(papers)} papers")
-
-    # Create concatenated results file
-    concat_path = concat_results(output_dir)
+    concat_path = output_dir / "all_results.jsonl"
+    with open(concat_path, "wb") as concat_file:
+        for conf in conferences:
+            for year in years:
+                old_file = (
+                    old_base_dir
+                    / conf
+                    / str(year)
+                    / "papers_on_detecting_access_control_vulnerabilities.jsonl"
+                )
+
+                if old_file.exists() and old_file.stat().st_size > 0:
+                    # Read papers from old file
+                    papers = []
+                    with open(old_file) as f:
+                        for line in f:
+                            if line.strip():  # Skip empty lines
+                                papers.append(json.loads(line))
+
+                    if papers:
+                        # Save to new location and the concatenated file
+                        save_results(
+                            papers, output_dir, conf, str(year), concat_file
+                        )
+                        print(f"Processed {conf} {year}: {len(papers)} papers")
+
     print(f"\nAll results concatenated to: {concat_path}")
 
     # Print summary
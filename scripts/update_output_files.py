@@ -1,34 +1,94 @@
-import json
+import hashlib
+import os
+import pickle
 import sys
 from pathlib import Path
 
+import orjson
+
 sys.path.append(".")
 
 
-def load_enriched_data(enriched_dir: str = "data/enriched"):
-    """Load all enriched data into a dictionary keyed by title"""
+def _enriched_signature(enriched_path: Path) -> str:
+    """Hash the names and mtimes of all enriched year files"""
+    sig = tuple(
+        sorted(
+            (str(p.relative_to(enriched_path)), p.stat().st_mtime_ns)
+            for p in enriched_path.glob("*/*.json")
+        )
+    )
+    return hashlib.sha1(repr(sig).encode()).hexdigest()
+
+
+def load_enriched_data(
+    enriched_dir: str = "data/enriched", use_cache: bool = True
+):
+    """Load all enriched data into a dictionary keyed by title
+
+    The index is pickled next to the enriched data and reused as long as
+    no year file has been added, removed or modified.
+    """
     enriched_data = {}
     enriched_path = Path(enriched_dir)
 
+    cache_path = (
+        enriched_path / f"_title_index_{_enriched_signature(enriched_path)}.pkl"
+    )
+    if use_cache and cache_path.exists():
+        with open(cache_path, "rb") as f:
+            return pickle.load(f)
+
     for conf_dir in enriched_path.iterdir():
         if not conf_dir.is_dir():
             continue
 
         for year_file in conf_dir.glob("*.json"):
-            with open(year_file) as f:
-                data = json.load(f)
-                for paper in data:
-                    if (
-                        paper.get("info", {}).get("type")
-                        == "Conference and Workshop Papers"
-                    ):
-                        title = paper["info"].get("title")
-                        if title:
-                            enriched_data[title] = paper
+            data = orjson.loads(year_file.read_bytes())
+            for paper in data:
+                if (
+                    paper.get("info", {}).get("type")
+                    == "Conference and Workshop Papers"
+                ):
+                    title = paper["info"].get("title")
+                    if title:
+                        enriched_data[title] = paper
+
+    if use_cache:
+        # Drop indexes built from older versions of the enriched data
+        for stale in enriched_path.glob("_title_index_*.pkl"):
+            stale.unlink()
+        with open(cache_path, "wb") as f:
+            pickle.dump(enriched_data, f, protocol=pickle.HIGHEST_PROTOCOL)
 
     return enriched_data
 
 
+def _enrich_paper(paper: dict, enriched_data: dict) -> bool:
+    """Apply enriched key/keywords to a paper, return True if it changed"""
+    enriched_paper = enriched_data.get(paper.get("title"))
+    if not enriched_paper:
+        return False
+
+    key = enriched_paper["info"].get("key", "N/A")
+    keywords = enriched_paper["info"].get("keywords", [])
+    if paper.get("key") == key and paper.get("keywords") == keywords:
+        return False
+
+    paper["key"] = key
+    paper["keywords"] = keywords
+    return True
+
+
+def _iter_papers(jsonl_file: Path):
+    """Stream non-empty papers from a JSONL file"""
+    with open(jsonl_file, "rb", buffering=1 << 16) as f:
+        for line in f:
+            if line.strip():  # Skip empty lines
+                paper = orjson.loads(line)
+                if paper:  # Skip empty entries
+                    yield paper
+
+
 def update_output_files(
     output_dir: str = "data/output", enriched_dir: str = "data/enriched"
 ):
@@ -38,34 +98,20 @@ def update_output_files(
 
     # Recursively find all .jsonl files
     for jsonl_file in output_path.rglob("*.jsonl"):
-        updated_papers = []
+        # Stream updated papers to a temp file, only swap it in if needed
+        tmp_file = jsonl_file.with_suffix(".jsonl.tmp")
         modified = False
+        with open(tmp_file, "wb", buffering=1 << 16) as f:
+            for paper in _iter_papers(jsonl_file):
+                if _enrich_paper(paper, enriched_data):
+                    modified = True
+                f.write(orjson.dumps(paper) + b"\n")
 
-        # Read and update each paper
-        with open(jsonl_file) as f:
-            for line in f:
-                if line.strip():  # Skip empty lines
-                    paper = json.loads(line)
-                    if paper:
-                        # Look up enriched data by title
-                        enriched_paper = enriched_data.get(paper["title"])
-                        if enriched_paper:
-                            paper["key"] = enriched_paper["info"].get(
-                                "key", "N/A"
-                            )
-                            paper["keywords"] = enriched_paper["info"].get(
-                                "keywords", []
-                            )
-                            modified = True
-                    updated_papers.append(paper)
-
-        # Write back updated papers if modified
         if modified:
-            with open(jsonl_file, "w") as f:
-                for paper in updated_papers:
-                    if paper:  # Skip empty entries
-                        f.write(json.dumps(paper) + "\n")
+            os.replace(tmp_file, jsonl_file)
             print(f"Updated {jsonl_file}")
+        else:
+            tmp_file.unlink()
 
 
 if __name__ == "__main__":
@@ -1,10 +1,16 @@
+import argparse
+import gzip
 import json
 import logging
-import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date
 from pathlib import Path
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException
+from urllib3.util.retry import Retry
 
 # Configure logging
 logging.basicConfig(
@@ -32,67 +38,104 @@ TEMPLATE = "https://dblp.org/search/publ/api?q=toc:db/journals/pacmse/pacmse1.bh
 """
 
 
+def create_session(
+    max_retries: int = 5, pool_size: int = 8
+) -> requests.Session:
+    """Create a pooled session that retries transient DBLP failures."""
+    retry = Retry(
+        total=max_retries,
+        backoff_factor=2,
+        status_forcelist=[429, 500, 502, 503, 504],
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
 def get_conference_papers(
-    conf: str, year: int, max_retries: int = 5, retry_delay: int = 10
+    session: requests.Session, conf: str, year: int
 ) -> list:
-    """Get papers from DBLP with retry mechanism."""
+    """Get papers from DBLP, retries are handled by the session adapter."""
     url = TEMPLATE.format(conf=conf, year=year, format="json")
 
-    for attempt in range(max_retries):
-        try:
-            res = requests.get(url, timeout=30)
-            res.raise_for_status()
+    try:
+        res = session.get(url, timeout=30)
+        res.raise_for_status()
 
-            data = res.json()["result"]["hits"]["hit"]
-            if data:
-                logging.info(
-                    f"Successfully retrieved {len(data)} papers for {conf} {year}"
-                )
-                return data
-            else:
-                logging.warning(f"No papers found for {conf} {year}")
-                return []
-
-        except (RequestException, json.JSONDecodeError, KeyError) as e:
-            if attempt < max_retries - 1:
-                logging.warning(
-                    f"Attempt {attempt + 1} failed for {conf} {year}: {str(e)}"
-                )
-                time.sleep(retry_delay)
-            else:
-                logging.error(
-                    f"Failed to get papers for {conf} {year} after {max_retries} attempts: {str(e)}"
-                )
-                return []
+        data = res.json()["result"]["hits"]["hit"]
+        if data:
+            logging.info(
+                f"Successfully retrieved {len(data)} papers for {conf} {year}"
+            )
+            return data
+        else:
+            logging.warning(f"No papers found for {conf} {year}")
+            return []
+
+    except (RequestException, json.JSONDecodeError, KeyError) as e:
+        logging.error(f"Failed to get papers for {conf} {year}: {str(e)}")
+        return []
 
 
 def save_json(data, path):
+    """Save papers as compact gzipped JSON."""
     path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w") as f:
-        json.dump(data, f, indent=4)
+    with gzip.open(path, "wb", compresslevel=3) as f:
+        f.write(orjson.dumps(data))
+
+
+def is_cached(path: Path, year: int) -> bool:
+    """Past proceedings are frozen, so an existing file needs no refetch."""
+    legacy_path = path.with_suffix("")  # <year>.json written before gzip
+    return year < date.today().year and (path.exists() or legacy_path.exists())
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fetch papers from DBLP")
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Re-download years that have already been saved",
+    )
+    args = parser.parse_args()
+
     confs = ["uss", "sp", "ccs", "ndss"]
     years = [2024, 2023, 2022, 2021, 2020, 2019, 2018, 2017, 2016, 2015]
     data_dir = Path("data/dblp")
     data_dir.mkdir(parents=True, exist_ok=True)
 
     failed_tasks = []
-
+    tasks = []
     for conf in confs:
         for year in years:
-            logging.info(f"Processing {conf} {year}")
-
-            data = get_conference_papers(conf, year)
+            if not args.refresh and is_cached(
+                data_dir / f"{conf}/{year}.json.gz", year
+            ):
+                logging.info(f"Skipping {conf} {year}, already downloaded")
+                continue
+            tasks.append((conf, year))
+    session = create_session()
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        future_to_task = {
+            executor.submit(get_conference_papers, session, *task): task
+            for task in tasks
+        }
+
+        for future in as_completed(future_to_task):
+            conf, year = future_to_task[future]
+            data = future.result()
             if not data:
                 failed_tasks.append((conf, year))
                 continue
 
             try:
-                save_json(data, data_dir / f"{conf}/{year}.json")
+                save_json(data, data_dir / f"{conf}/{year}.json.gz")
                 logging.info(f"Successfully saved data for {conf} {year}")
-                time.sleep(5)  # Add delay between requests
             except Exception as e:
                 logging.error(
                     f"Failed to save data for {conf} {year}: {str(e)}"
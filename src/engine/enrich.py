@@ -1,7 +1,11 @@
+import gzip
 import json
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+import orjson
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s - %(levelname)s - %(message)s",
@@ -12,6 +16,24 @@ logging.basicConfig(
 )
 
 
+def _parse_sema_file(file: Path) -> dict:
+    """Parse one semantic scholar file into a {dblp_id: paper} mapping."""
+    partial = {}
+    try:
+        for paper in orjson.loads(file.read_bytes()):
+            if "externalIds" in paper and "DBLP" in paper["externalIds"]:
+                # Use DBLP ID as key for matching
+                dblp_id = paper["externalIds"]["DBLP"]
+                partial[dblp_id] = {
+                    "paperId": paper.get("paperId"),
+                    "title": paper.get("title"),
+                    "abstract": paper.get("abstract"),
+                }
+    except Exception as e:
+        logging.error(f"Error processing {file}: {str(e)}")
+    return partial
+
+
 def merge_sema_data(conf: str) -> dict:
     """Merge semantic scholar data for a conference across all years."""
     sema_dir = Path("data/sema") / conf
@@ -21,28 +43,21 @@ def merge_sema_data(conf: str) -> dict:
         logging.error(f"Directory not found: {sema_dir}")
         return merged_data
 
-    for file in sema_dir.glob("*.json"):
-        try:
-            with open(file) as f:
-                data = json.load(f)
-                for paper in data:
-                    if (
-                        "externalIds" in paper
-                        and "DBLP" in paper["externalIds"]
-                    ):
-                        # Use DBLP ID as key for matching
-                        dblp_id = paper["externalIds"]["DBLP"]
-                        merged_data[dblp_id] = {
-                            "paperId": paper.get("paperId"),
-                            "title": paper.get("title"),
-                            "abstract": paper.get("abstract"),
-                        }
-        except Exception as e:
-            logging.error(f"Error processing {file}: {str(e)}")
+    # Conferences already run in separate processes, see main()
+    for file in sorted(sema_dir.glob("*.json")):
+        merged_data.update(_parse_sema_file(file))
 
     return merged_data
 
 
+def load_dblp_file(file: Path) -> list:
+    """Load a DBLP dump, either gzipped (<year>.json.gz) or plain JSON."""
+    if file.suffix == ".gz":
+        with gzip.open(file, "rb") as f:
+            return orjson.loads(f.read())
+    return orjson.loads(file.read_bytes())
+
+
 def enrich_dblp_data(conf: str, sema_data: dict) -> None:
     """Enrich DBLP data with Semantic Scholar information."""
     dblp_dir = Path("data/dblp") / conf
@@ -53,12 +68,17 @@ def enrich_dblp_data(conf: str, sema_data: dict) -> None:
         logging.error(f"Directory not found: {dblp_dir}")
         return
 
-    for file in dblp_dir.glob("*.json"):
-        if file.name != "2024.json":
+    # Prefer the gzipped dump when both formats exist for a year
+    dblp_files = {
+        file.name.split(".")[0]: file
+        for file in sorted(dblp_dir.glob("*.json*"))
+    }
+
+    for year, file in dblp_files.items():
+        if year != "2024":
             continue
         try:
-            with open(file) as f:
-                dblp_papers = json.load(f)
+            dblp_papers = load_dblp_file(file)
 
             # Enrich each paper with semantic scholar data
             for paper in dblp_papers:
@@ -71,30 +91,36 @@ def enrich_dblp_data(conf: str, sema_data: dict) -> None:
                         ]
 
             # Save enriched data
-            output_file = output_dir / file.name
+            output_file = output_dir / f"{year}.json"
             with open(output_file, "w") as f:
                 json.dump(dblp_papers, f, indent=4)
 
-            logging.info(f"Successfully enriched and saved {file.name}")
+            logging.info(f"Successfully enriched and saved {output_file.name}")
 
         except Exception as e:
             logging.error(f"Error processing {file}: {str(e)}")
 
 
-def main():
-    confs = ["uss", "sp", "ccs", "ndss"]
+def process_conference(conf: str) -> None:
+    """Merge semantic scholar data and enrich DBLP data for a conference."""
+    logging.info(f"Processing conference: {conf}")
+
+    # Step 1: Merge semantic scholar data
+    logging.info(f"Merging semantic scholar data for {conf}")
+    sema_data = merge_sema_data(conf)
+    logging.info(f"Found {len(sema_data)} papers in semantic scholar data")
 
-    for conf in confs:
-        logging.info(f"Processing conference: {conf}")
+    # Step 2: Enrich DBLP data
+    logging.info(f"Enriching DBLP data for {conf}")
+    enrich_dblp_data(conf, sema_data)
 
-        # Step 1: Merge semantic scholar data
-        logging.info(f"Merging semantic scholar data for {conf}")
-        sema_data = merge_sema_data(conf)
-        logging.info(f"Found {len(sema_data)} papers in semantic scholar data")
 
-        # Step 2: Enrich DBLP data
-        logging.info(f"Enriching DBLP data for {conf}")
-        enrich_dblp_data(conf, sema_data)
+def main():
+    confs = ["uss", "sp", "ccs", "ndss"]
+
+    # Conferences are independent, so process them in parallel
+    with ProcessPoolExecutor(max_workers=len(confs)) as executor:
+        list(executor.map(process_conference, confs))
 
     logging.info("Data enrichment completed")
 
@@ -1,11 +1,22 @@
 import argparse
-import json
 import logging
+import os
+import threading
 import time
+from collections import Counter, defaultdict
 from collections.abc import Iterator
+from concurrent.futures import (
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
 from pathlib import Path
 from typing import NamedTuple
 
+import ijson
+import orjson
+
+from src.engine.spider.cache import SpiderCache
 from src.engine.spider.spider_manager import SpiderManager
 
 # Configure logging
@@ -35,6 +46,87 @@ class PaperInfo(NamedTuple):
     url: str
 
 
+def _missing_index_path(file: Path) -> Path:
+    """Sidecar listing the papers of a year file that miss an abstract"""
+    return file.with_suffix(".missing.jsonl")
+
+
+def _read_missing_index(index_path: Path) -> list[tuple[int, str]]:
+    """Read (paper index, url) pairs from a missing-abstract sidecar"""
+    with open(index_path, "rb") as f:
+        return [(entry["idx"], entry["url"]) for entry in map(orjson.loads, f)]
+
+
+def _write_missing_index(
+    index_path: Path, entries: list[tuple[int, str]]
+) -> None:
+    """Atomically replace a missing-abstract sidecar"""
+    tmp_path = index_path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        for idx, url in entries:
+            f.write(orjson.dumps({"idx": idx, "url": url}) + b"\n")
+    os.replace(tmp_path, index_path)
+
+
+def _scan_one_file(file: Path) -> list[PaperInfo]:
+    """
+    Find the papers with missing abstracts in one conference year file
+
+    The result is kept in a sidecar index next to the file and only
+    rebuilt when the year file is newer than it.
+
+    Args:
+        file: Path to <enriched_dir>/<conference>/<year>.json
+
+    Returns:
+        PaperInfo for papers missing abstracts
+    """
+    conference = file.parent.name
+    year = file.stem  # Get year from filename
+    index_path = _missing_index_path(file)
+
+    try:
+        if (
+            index_path.exists()
+            and index_path.stat().st_mtime_ns >= file.stat().st_mtime_ns
+        ):
+            return [
+                PaperInfo(conference, year, idx, url)
+                for idx, url in _read_missing_index(index_path)
+            ]
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable index {index_path}: {str(e)}")
+
+    entries = []
+    try:
+        # Stream papers instead of materializing the whole file
+        with open(file, "rb", buffering=64 * 1024) as f:
+            papers = ijson.items(f, "item")
+            for i, paper in enumerate(papers):
+                # Check if abstract is missing and URL exists
+                if (
+                    "info" in paper
+                    and "ee" in paper["info"]
+                    and (
+                        "abstract" not in paper["info"]
+                        or not paper["info"]["abstract"]
+                    )
+                    and paper["info"]["type"] != "Editorship"
+                ):
+                    entries.append((i, paper["info"]["ee"]))
+
+    except Exception as e:
+        logger.error(f"Error processing {file}: {str(e)}")
+        return [PaperInfo(conference, year, idx, url) for idx, url in entries]
+
+    try:
+        _write_missing_index(index_path, entries)
+    except OSError as e:
+        logger.warning(f"Failed to write index {index_path}: {str(e)}")
+
+    return [PaperInfo(conference, year, idx, url) for idx, url in entries]
+
+
 def find_papers_missing_abstract(
     enriched_dir: Path, conference: str | None = None, year: str | None = None
 ) -> Iterator[PaperInfo]:
@@ -54,11 +146,12 @@ def find_papers_missing_abstract(
         [enriched_dir / conference] if conference else enriched_dir.iterdir()
     )
 
+    # Enumerate every year file first, then scan them in parallel
+    files = []
     for conf_dir in conf_dirs:
         if not conf_dir.is_dir():
             continue
 
-        conference = conf_dir.name
         # Filter years if specified
         json_files = (
             [conf_dir / f"{year}.json"] if year else conf_dir.glob("*.json")
@@ -68,55 +161,105 @@ def find_papers_missing_abstract(
             if not file.exists():
                 logger.warning(f"File not found: {file}")
                 continue
+            files.append(file)
 
-            try:
-                with open(file) as f:
-                    papers = json.load(f)
-
-                year = file.stem  # Get year from filename
-                for i, paper in enumerate(papers):
-                    # Check if abstract is missing and URL exists
-                    if (
-                        "info" in paper
-                        and "ee" in paper["info"]
-                        and (
-                            "abstract" not in paper["info"]
-                            or not paper["info"]["abstract"]
-                        )
-                        and paper["info"]["type"] != "Editorship"
-                    ):
-                        yield PaperInfo(
-                            conference, year, i, paper["info"]["ee"]
-                        )
-
-            except Exception as e:
-                logger.error(f"Error processing {file}: {str(e)}")
-
+    if not files:
+        return
 
-def update_paper_abstract(
-    file_path: Path, paper_index: int, abstract: str, pdf_url: str
-) -> None:
+    max_workers = min(os.cpu_count() or 1, len(files))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for missing in executor.map(_scan_one_file, files, chunksize=4):
+            yield from missing
+
+
+class ProgressLog:
+    """Append-only log of handled papers so interrupted runs can resume"""
+
+    def __init__(self, path: Path, fsync_every: int = 50):
+        """
+        Initialize the progress log
+
+        Args:
+            path: JSONL file with one record per handled paper
+            fsync_every: Number of records between syncs to disk
+        """
+        self.path = path
+        self.fsync_every = fsync_every
+        self._file = None
+        self._unsynced = 0
+
+    def load(self) -> dict[tuple[str, str, str], str]:
+        """
+        Return the last recorded status of each (conf, year, url)
+
+        Papers are keyed by URL rather than position, which shifts when a
+        year file is regenerated.
+        """
+        statuses = {}
+        if not self.path.exists():
+            return statuses
+
+        with open(self.path, "rb") as f:
+            for line in f:
+                try:
+                    record = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    # A torn last line from a killed run
+                    continue
+                # Records of older runs only hold the paper index
+                if "url" not in record:
+                    continue
+                key = (record["conf"], record["year"], record["url"])
+                statuses[key] = record["status"]
+        return statuses
+
+    def record(self, paper_info: PaperInfo, status: str) -> None:
+        """Append the status ("ok" or "fail") of a handled paper"""
+        if self._file is None:
+            self._file = open(self.path, "ab")
+
+        record = {
+            "conf": paper_info.conference,
+            "year": paper_info.year,
+            "url": paper_info.url,
+            "status": status,
+            "ts": time.time(),
+        }
+        self._file.write(orjson.dumps(record) + b"\n")
+
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_every:
+            self.sync()
+
+    def sync(self) -> None:
+        """Flush pending records to disk"""
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def close(self) -> None:
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+
+def load_year_file(file_path: Path) -> list[dict]:
+    """Load all papers of a conference year file"""
+    return orjson.loads(file_path.read_bytes())
+
+
+def flush_year_file(file_path: Path, papers: list[dict]) -> None:
     """
-    Update paper abstract and PDF URL in the JSON file
+    Write a conference year file back after all its updates are applied
 
     Args:
         file_path: Path to JSON file
-        paper_index: Index of paper to update
-        abstract: New abstract text
-        pdf_url: URL to PDF file (empty string if not available)
+        papers: Updated papers of the file
     """
     try:
-        # Read current data
-        with open(file_path) as f:
-            papers = json.load(f)
-
-        # Update abstract and PDF URL
-        papers[paper_index]["info"]["abstract"] = abstract
-        papers[paper_index]["info"]["pdf_url"] = pdf_url
-
-        # Save updated data
-        with open(file_path, "w") as f:
-            json.dump(papers, f, indent=4)
+        file_path.write_bytes(orjson.dumps(papers, option=orjson.OPT_INDENT_2))
 
     except Exception as e:
         logger.error(f"Error updating {file_path}: {str(e)}")
@@ -137,9 +280,73 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "-y", "--year", help="Year to update (default: all years)"
     )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=8,
+        help="Number of concurrent fetch threads (default: 8)",
+    )
+    parser.add_argument(
+        "--per-host",
+        type=int,
+        default=2,
+        help="Maximum concurrent requests per conference site (default: 2)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Neither read nor write the spider result cache",
+    )
+    parser.add_argument(
+        "--force-refresh",
+        action="store_true",
+        help="Ignore cached spider results but store the new ones",
+    )
+    parser.add_argument(
+        "--retry-failed",
+        action="store_true",
+        help="Retry papers that failed in previous runs",
+    )
     return parser.parse_args()
 
 
+def fetch_paper_info(
+    paper_info: PaperInfo,
+    host_limit: threading.Semaphore,
+    cache: SpiderCache | None = None,
+    refresh: bool = False,
+) -> dict[str, str] | None:
+    """
+    Fetch paper info with the spider of its conference
+
+    Args:
+        paper_info: Paper to fetch
+        host_limit: Semaphore bounding concurrent requests to the site
+        cache: Optional cache of previous spider results
+        refresh: Skip cache lookups (results are still stored)
+
+    Returns:
+        Paper info if successful, None if failed
+    """
+    # Cache hits skip the site slot, spiders rate limit the actual requests
+    if cache is not None and not refresh:
+        hit, result = cache.get(paper_info.url)
+        if hit:
+            return result
+
+    with host_limit:
+        spider_manager = SpiderManager(paper_info.conference)
+        result = spider_manager.get_paper_info(paper_info.url)
+
+    if cache is not None:
+        try:
+            cache.set(paper_info.url, result)
+        except OSError as e:
+            logger.warning(f"Failed to cache {paper_info.url}: {str(e)}")
+    return result
+
+
 def main():
     args = parse_args()
 
@@ -149,54 +356,123 @@ def main():
         return
 
     # Statistics
-    total_missing = 0
     updated = 0
     failed = 0
 
-    # Process papers with missing abstracts
-    for paper_info in find_papers_missing_abstract(
-        enriched_dir, args.conference, args.year
-    ):
-        time.sleep(5)
-        total_missing += 1
+    # Materialize the work list so we know how many results each file awaits
+    paper_infos = list(
+        find_papers_missing_abstract(enriched_dir, args.conference, args.year)
+    )
+    total_missing = len(paper_infos)
+
+    # Skip papers handled by previous runs
+    progress = ProgressLog(enriched_dir / ".enrich_progress.jsonl")
+    statuses = progress.load()
+    skip = {"ok"} if args.retry_failed else {"ok", "fail"}
+    paper_infos = [
+        p
+        for p in paper_infos
+        if statuses.get((p.conference, p.year, p.url)) not in skip
+    ]
+    if len(paper_infos) < total_missing:
         logger.info(
-            f"Processing {paper_info.conference} {paper_info.year} "
-            f"paper {paper_info.paper_index}"
+            f"Skipping {total_missing - len(paper_infos)} papers "
+            "handled in previous runs"
         )
 
+    def year_file_path(paper_info: PaperInfo) -> Path:
+        return enriched_dir / paper_info.conference / f"{paper_info.year}.json"
+
+    pending = Counter(year_file_path(p) for p in paper_infos)
+    # Year files with updates, each loaded once and written once
+    year_files: dict[Path, list[dict]] = {}
+    # Successes are only recorded once their year file is on disk
+    updated_papers: dict[Path, list[PaperInfo]] = {}
+
+    def flush(file_path: Path) -> None:
+        flush_year_file(file_path, year_files.pop(file_path))
+        for paper_info in updated_papers.pop(file_path, []):
+            progress.record(paper_info, "ok")
+
+    # Each conference is served by a single site, bound requests per site
+    host_limits: dict[str, threading.Semaphore] = {}
+    cache = None if args.no_cache else SpiderCache()
+
+    # The same URL may be listed in several year files, fetch it only once
+    url_to_targets: defaultdict[str, list[PaperInfo]] = defaultdict(list)
+    for paper_info in paper_infos:
+        url_to_targets[paper_info.url].append(paper_info)
+    urls = list(url_to_targets)
+
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
         try:
-            # Get spider for conference
-            spider_manager = SpiderManager(paper_info.conference)
-
-            # Get paper info
-            result = spider_manager.get_paper_info(paper_info.url)
-
-            if result and result["abstract"]:
-                # Update paper with new abstract and PDF URL
-                file_path = (
-                    enriched_dir
-                    / paper_info.conference
-                    / f"{paper_info.year}.json"
-                )
-                update_paper_abstract(
-                    file_path,
-                    paper_info.paper_index,
-                    result["abstract"],
-                    result.get(
-                        "pdf_url", ""
-                    ),  # Use empty string if pdf_url not present
-                )
-                updated += 1
-                logger.info(
-                    f"Successfully updated abstract for {paper_info.url}"
-                )
-            else:
-                failed += 1
-                logger.warning(f"Failed to get abstract for {paper_info.url}")
-
-        except Exception as e:
-            failed += 1
-            logger.error(f"Error processing {paper_info.url}: {str(e)}")
+            # Submit in batches to keep the number of pending futures bounded
+            for start in range(0, len(urls), 100):
+                future_to_url = {}
+                for url in urls[start : start + 100]:
+                    paper_info = url_to_targets[url][0]
+                    host_limit = host_limits.setdefault(
+                        paper_info.conference,
+                        threading.BoundedSemaphore(args.per_host),
+                    )
+                    future = executor.submit(
+                        fetch_paper_info,
+                        paper_info,
+                        host_limit,
+                        cache,
+                        args.force_refresh,
+                    )
+                    future_to_url[future] = url
+
+                # Results are applied from this thread only, so no races
+                for future in as_completed(future_to_url):
+                    url = future_to_url[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = None
+                        logger.error(f"Error processing {url}: {str(e)}")
+
+                    for paper_info in url_to_targets[url]:
+                        file_path = year_file_path(paper_info)
+                        logger.info(
+                            f"Processing {paper_info.conference} "
+                            f"{paper_info.year} paper {paper_info.paper_index}"
+                        )
+
+                        if result and result["abstract"]:
+                            # Update paper with new abstract and PDF URL
+                            if file_path not in year_files:
+                                year_files[file_path] = load_year_file(
+                                    file_path
+                                )
+                            info = year_files[file_path][
+                                paper_info.paper_index
+                            ]["info"]
+                            info["abstract"] = result["abstract"]
+                            # Use empty string if pdf_url not present
+                            info["pdf_url"] = result.get("pdf_url", "")
+                            updated_papers.setdefault(file_path, []).append(
+                                paper_info
+                            )
+                            updated += 1
+                            logger.info(
+                                f"Successfully updated abstract for {url}"
+                            )
+                        else:
+                            failed += 1
+                            progress.record(paper_info, "fail")
+                            logger.warning(f"Failed to get abstract for {url}")
+
+                        # Write the file once its last paper has been handled
+                        pending[file_path] -= 1
+                        if pending[file_path] == 0 and file_path in year_files:
+                            flush(file_path)
+        finally:
+            # Don't lose applied updates if the run is interrupted
+            for file_path in list(year_files):
+                flush(file_path)
+            progress.close()
 
     # Log final statistics
     logger.info("Processing completed:")
@@ -1,10 +1,12 @@
-import json
 import logging
+import random
 import time
-from datetime import datetime
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Any
 
+import orjson
 from httpcore import RemoteProtocolError
 from semanticscholar import SemanticScholar
 
@@ -27,21 +29,20 @@ CONFERENCE = {
 }
 
 
-class CustomJSONEncoder(json.JSONEncoder):
-    """Custom JSON encoder to handle special types."""
-
-    def default(self, obj):
-        if hasattr(obj, "__dict__"):
-            return obj.__dict__
-        elif isinstance(obj, datetime):
-            return obj.isoformat()
-        return super().default(obj)
+def json_default(obj):
+    """Serialize objects orjson doesn't handle natively (datetime it does)."""
+    if hasattr(obj, "__dict__"):
+        return obj.__dict__
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
 
 
 def get_conference_papers(
-    conf: str, year: int, max_retries: int = 3, retry_delay: int = 10
+    conf: str,
+    year: str | int,
+    max_retries: int = 3,
+    retry_delay: int = 10,
 ) -> list[dict[Any, Any]]:
-    """Get papers with retry mechanism."""
+    """Get papers with retry mechanism, year may be a "start-end" range."""
     for attempt in range(max_retries):
         try:
             results = sch.search_paper(
@@ -51,9 +52,10 @@ def get_conference_papers(
                 bulk=True,
             )
 
-            # Only keep the _data field from each paper
+            # Only keep the _data field from each paper, iterating the
+            # results fetches every page of a multi-year range
             papers = []
-            for paper in results.items:
+            for paper in results:
                 if hasattr(paper, "_data"):
                     papers.append(paper._data)
                 else:
@@ -67,7 +69,9 @@ def get_conference_papers(
                 logging.warning(
                     f"Attempt {attempt + 1} failed for {conf} {year}: {str(e)}"
                 )
-                time.sleep(retry_delay)
+                # Exponential backoff with jitter so workers don't retry
+                # in lock-step against the rate limit
+                time.sleep(retry_delay * 2**attempt + random.uniform(0, 1))
             else:
                 logging.error(
                     f"Failed to get papers for {conf} {year} after {max_retries} attempts: {str(e)}"
@@ -75,10 +79,23 @@ def get_conference_papers(
                 return []
 
 
+def group_by_year(papers: list[dict[Any, Any]]) -> dict[int, list[dict]]:
+    """Partition papers of a year range query by publication year."""
+    by_year = defaultdict(list)
+    for paper in papers:
+        year = paper.get("year")
+        if year is None and paper.get("publicationDate"):
+            year = int(str(paper["publicationDate"])[:4])
+        if year is not None:
+            by_year[int(year)].append(paper)
+    return by_year
+
+
 def save_json(data, path):
     path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w") as f:
-        json.dump(data, f, indent=4, cls=CustomJSONEncoder)
+    path.write_bytes(
+        orjson.dumps(data, default=json_default, option=orjson.OPT_INDENT_2)
+    )
 
 
 if __name__ == "__main__":
@@ -88,25 +105,36 @@ if __name__ == "__main__":
     data_dir.mkdir(parents=True, exist_ok=True)
 
     failed_tasks = []
-
-    for conf in confs:
-        for year in years:
-            logging.info(f"Processing {conf} {year}")
-            data = get_conference_papers(CONFERENCE[conf], year)
-
-            if not data:
-                logging.error(f"Failed to get data for {conf} {year}")
-                failed_tasks.append((conf, year))
-                continue
-            try:
-                save_json(data, data_dir / f"{conf}/{year}.json")
-                logging.info(f"Successfully saved data for {conf} {year}")
-                time.sleep(5)  # Add delay between requests
-            except Exception as e:
-                logging.error(
-                    f"Failed to save data for {conf} {year}: {str(e)}"
-                )
-                failed_tasks.append((conf, year))
+    # One bulk query per venue covers the whole year range
+    year_range = f"{min(years)}-{max(years)}"
+
+    with ThreadPoolExecutor(max_workers=len(confs)) as executor:
+        future_to_conf = {
+            executor.submit(
+                get_conference_papers, CONFERENCE[conf], year_range
+            ): conf
+            for conf in confs
+        }
+
+        # Files are written from the main thread only
+        for future in as_completed(future_to_conf):
+            conf = future_to_conf[future]
+            by_year = group_by_year(future.result())
+
+            for year in years:
+                data = by_year.get(year)
+                if not data:
+                    logging.error(f"Failed to get data for {conf} {year}")
+                    failed_tasks.append((conf, year))
+                    continue
+                try:
+                    save_json(data, data_dir / f"{conf}/{year}.json")
+                    logging.info(f"Successfully saved data for {conf} {year}")
+                except Exception as e:
+                    logging.error(
+                        f"Failed to save data for {conf} {year}: {str(e)}"
+                    )
+                    failed_tasks.append((conf, year))
 
     if failed_tasks:
         logging.warning("Failed tasks:")
@@ -1,8 +1,10 @@
 import logging
-import os
 from abc import ABC, abstractmethod
 from pathlib import Path
 
+from .http_client import get_session
+from .log_setup import attach_queue_handler
+
 
 class BaseSpider(ABC):
     """Base spider class for paper abstract extraction"""
@@ -15,6 +17,7 @@ class BaseSpider(ABC):
             conf: name for logging
         """
         self.name = self.__class__.__name__
+        self.session = get_session()
         self._setup_logger(conf)
 
     def _setup_logger(self, conf: str) -> None:
@@ -28,36 +31,9 @@ class BaseSpider(ABC):
         self.logger = logging.getLogger(f"spider.{self.name}")
         self.logger.setLevel(logging.INFO)
 
-        # 如果已经有处理器，说明已经配置过，直接返回
-        if self.logger.handlers:
-            return
-
-        # Create formatters
-        file_formatter = logging.Formatter(
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-        )
-        console_formatter = logging.Formatter(
-            "%(asctime)s - %(levelname)s - %(message)s"
-        )
-
-        # Create and configure file handler
-        log_dir = Path("log/spider") / conf
-        os.makedirs(log_dir, exist_ok=True)
-
-        file_handler = logging.FileHandler(
-            log_dir / f"{self.name.lower()}.log", encoding="utf-8"
-        )
-        file_handler.setLevel(logging.INFO)
-        file_handler.setFormatter(file_formatter)
-
-        # Create and configure console handler
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
-        console_handler.setFormatter(console_formatter)
-
-        # Add handlers to logger
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
+        # Log I/O happens on a background thread, off the request path
+        log_file = Path("log/spider") / conf / f"{self.name.lower()}.log"
+        attach_queue_handler(self.logger, log_file)
 
     @abstractmethod
     def get_paper_info(self, url: str) -> dict[str, str] | None:
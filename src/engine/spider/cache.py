@@ -0,0 +1,70 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+
+class SpiderCache:
+    """File based cache of spider results keyed by paper URL"""
+
+    def __init__(
+        self,
+        cache_dir: str = "data/cache/spider",
+        ttl: float = 90 * 86400,
+        negative_ttl: float = 86400,
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            cache_dir: Directory holding one JSON file per URL
+            ttl: Seconds a successful result stays valid
+            negative_ttl: Seconds a failed (None) result stays valid, kept
+                short so transient failures get retried soon
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+
+    def _get_cache_path(self, url: str) -> Path:
+        key = hashlib.sha1(url.encode(), usedforsecurity=False).hexdigest()
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, url: str) -> tuple[bool, dict[str, str] | None]:
+        """
+        Look up the cached result for a URL
+
+        Returns:
+            (hit, result) where result may be None for a cached failure
+        """
+        cache_path = self._get_cache_path(url)
+        try:
+            with open(cache_path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return False, None
+
+        if entry["expires_at"] < time.time():
+            return False, None
+        return True, entry["result"]
+
+    def set(self, url: str, result: dict[str, str] | None) -> None:
+        """Store a spider result, None marks a failed extraction"""
+        ttl = self.ttl if result else self.negative_ttl
+        entry = {
+            "url": url,
+            "result": result,
+            "expires_at": time.time() + ttl,
+        }
+
+        # Write to a temp file first so readers never see partial entries
+        cache_path = self._get_cache_path(url)
+        tmp_path = cache_path.with_suffix(
+            f".{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        with open(tmp_path, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, cache_path)
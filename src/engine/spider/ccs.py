@@ -1,12 +1,16 @@
-import random
-import re
-import time
-
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 
 from .base_spider import BaseSpider
-from .utils import retry_on_failure
+from .utils import retry_on_failure, safe_request
+
+_DOI_PREFIX = "https://doi.org/"
+_DOI_PREFIX_LEN = len(_DOI_PREFIX)
+_ACM_PREFIX = "https://dl.acm.org/doi/"
+# Only the abstract section is needed, skip building the rest of the page
+_ABSTRACT_STRAINER = SoupStrainer("div", id="abstracts")
+# Transient errors are retried here, get_paper_info turns the rest into None
+_fetch = retry_on_failure(max_retries=3, delay=6.0)(safe_request)
 
 
 class CCSSpider(BaseSpider):
@@ -20,10 +24,7 @@ class CCSSpider(BaseSpider):
             "Connection": "keep-alive",
             "Upgrade-Insecure-Requests": "1",
         }
-        # Add session to maintain cookies
-        self.session = requests.Session()
 
-    @retry_on_failure(max_retries=3, delay=6.0)
     def get_paper_info(self, url: str) -> dict[str, str] | None:
         """
         Extract abstract from a CCS paper given its DOI URL
@@ -38,23 +39,17 @@ class CCSSpider(BaseSpider):
             self.logger.info(f"Fetching paper info from {url}")
 
             # Convert DOI URL to ACM DL URL if needed
-            if url.startswith("https://doi.org/"):
-                acm_url = url.replace(
-                    "https://doi.org/", "https://dl.acm.org/doi/"
-                )
+            if url.startswith(_DOI_PREFIX):
+                acm_url = _ACM_PREFIX + url[_DOI_PREFIX_LEN:]
             else:
                 acm_url = url
 
-            # Add random delay between requests
-            time.sleep(random.uniform(2, 5))
+            # Shared session with custom headers, within the ACM DL rate limit
+            response = _fetch(acm_url, headers=self.headers)
 
-            # Use session with custom headers
-            response = self.session.get(
-                acm_url, headers=self.headers, timeout=30
+            soup = BeautifulSoup(
+                response.text, "lxml", parse_only=_ABSTRACT_STRAINER
             )
-            response.raise_for_status()
-
-            soup = BeautifulSoup(response.text, "html.parser")
 
             # Find the abstract section
             abstract_div = soup.find("div", {"id": "abstracts"})
@@ -70,7 +65,7 @@ class CCSSpider(BaseSpider):
 
             # Clean up the text
             text = abstract_text.get_text(strip=True)
-            text = re.sub(r"\s+", " ", text)
+            text = " ".join(text.split())
 
             self.logger.info(f"Successfully extracted abstract from {url}")
             return {"abstract": text, "pdf_url": ""}
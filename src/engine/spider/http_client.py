@@ -0,0 +1,93 @@
+import threading
+
+import cloudscraper
+import requests
+from requests.adapters import HTTPAdapter
+
+from .ratelimit import limiter
+
+# Spiders run on a thread pool against a handful of hosts, so keep enough
+# pooled keep-alive connections per host for every worker
+POOL_CONNECTIONS = 16
+POOL_MAXSIZE = 32
+DEFAULT_TIMEOUT = 30
+# Markers of a Cloudflare interstitial served instead of the real page
+CHALLENGE_MARKERS = ("cf-chl", "challenge-platform", "<title>Just a moment")
+
+_lock = threading.Lock()
+_session: requests.Session | None = None
+_scraper: requests.Session | None = None
+
+
+def get_session() -> requests.Session:
+    """
+    Return the session shared by all spiders
+
+    Reusing one session keeps TCP/TLS connections to dl.acm.org, usenix.org,
+    ndss-symposium.org and ieeexplore.ieee.org alive across papers.
+    """
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=POOL_CONNECTIONS,
+                    pool_maxsize=POOL_MAXSIZE,
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                # Honor Retry-After of throttled responses for later requests
+                session.hooks["response"].append(_update_limiter)
+                _session = session
+    return _session
+
+
+def _update_limiter(response: requests.Response, *args, **kwargs) -> None:
+    limiter.update_from_response(response)
+
+
+def get_scraper() -> requests.Session:
+    """Return the shared cloudscraper session for Cloudflare protected hosts"""
+    global _scraper
+    if _scraper is None:
+        with _lock:
+            if _scraper is None:
+                _scraper = cloudscraper.create_scraper(
+                    browser={
+                        "browser": "chrome",
+                        "platform": "windows",
+                        "mobile": False,
+                    }
+                )
+    return _scraper
+
+
+def is_challenge(response: requests.Response) -> bool:
+    """Check whether a response is a Cloudflare challenge page"""
+    if response.status_code == 403:
+        return True
+    if response.status_code != 503:
+        return False
+    return any(marker in response.text for marker in CHALLENGE_MARKERS)
+
+
+def get_with_challenge_fallback(url: str, **kwargs) -> requests.Response:
+    """
+    GET a page with the shared session, solving a Cloudflare challenge only
+    when the plain request is rejected with one
+
+    Cookies obtained by the scraper are copied into the shared session so
+    later requests can skip the challenge.
+    """
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+    session = get_session()
+    response = session.get(url, **kwargs)
+    if not is_challenge(response):
+        return response
+
+    scraper = get_scraper()
+    response = scraper.get(url, **kwargs)
+    limiter.update_from_response(response)
+    session.cookies.update(scraper.cookies)
+    return response
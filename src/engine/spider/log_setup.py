@@ -0,0 +1,79 @@
+import atexit
+import logging
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from pathlib import Path
+
+
+class _FileRouter(logging.Handler):
+    """Dispatch records to the log file registered for their logger"""
+
+    def __init__(self):
+        super().__init__()
+        self.file_handlers: dict[str, logging.Handler] = {}
+
+    def emit(self, record: logging.LogRecord) -> None:
+        handler = self.file_handlers.get(record.name)
+        if handler is not None:
+            handler.handle(record)
+
+
+_log_queue: queue.Queue = queue.Queue(-1)
+_file_router = _FileRouter()
+_lock = threading.Lock()
+_listener: QueueListener | None = None
+
+
+def _start_listener() -> None:
+    """Start the background thread that writes all spider logs"""
+    global _listener
+    if _listener is not None:
+        return
+
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.INFO)
+    console_handler.setFormatter(
+        logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
+    )
+
+    _listener = QueueListener(
+        _log_queue,
+        _file_router,
+        console_handler,
+        respect_handler_level=True,
+    )
+    _listener.start()
+    # Drain queued records before the interpreter exits
+    atexit.register(_listener.stop)
+
+
+def attach_queue_handler(logger: logging.Logger, log_file: Path) -> None:
+    """
+    Send a logger's records through the shared queue
+
+    Args:
+        logger: Logger to configure, left untouched if it has handlers
+        log_file: File receiving the logger's records
+    """
+    with _lock:
+        if logger.handlers:
+            return
+        _start_listener()
+
+        log_file.parent.mkdir(parents=True, exist_ok=True)
+        file_handler = RotatingFileHandler(
+            log_file,
+            maxBytes=10 * 1024 * 1024,
+            backupCount=3,
+            encoding="utf-8",
+        )
+        file_handler.setLevel(logging.INFO)
+        file_handler.setFormatter(
+            logging.Formatter(
+                "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+            )
+        )
+        _file_router.file_handlers[logger.name] = file_handler
+
+        logger.addHandler(QueueHandler(_log_queue))
@@ -1,8 +1,17 @@
-import requests
-from bs4 import BeautifulSoup
+import re
+
+from bs4 import BeautifulSoup, SoupStrainer
 
 from .base_spider import BaseSpider
-from .utils import get_default_headers, retry_on_failure
+from .utils import get_default_headers, retry_on_failure, safe_request
+
+# Paper pages use one of two layouts, keep only the blocks either one needs
+_PAPER_STRAINER = SoupStrainer(
+    ["div", "section", "a"],
+    class_=re.compile(r"\b(paper-data|new-wrapper|pdf-button)\b"),
+)
+# Transient errors are retried here, get_paper_info turns the rest into None
+_fetch = retry_on_failure(max_retries=3, delay=2.0)(safe_request)
 
 
 class NDSSSpider(BaseSpider):
@@ -11,7 +20,6 @@ class NDSSSpider(BaseSpider):
         self.base_url = "https://www.ndss-symposium.org"
         self.headers = get_default_headers()
 
-    @retry_on_failure(max_retries=3, delay=2.0)
     def get_paper_info(self, paper_url: str) -> dict[str, str] | None:
         """
         Extract abstract and PDF URL from paper page
@@ -24,10 +32,11 @@ class NDSSSpider(BaseSpider):
         """
         try:
             self.logger.info(f"Fetching paper info from {paper_url}")
-            response = requests.get(paper_url, headers=self.headers)
-            response.raise_for_status()
+            response = _fetch(paper_url, headers=self.headers)
 
-            soup = BeautifulSoup(response.text, "html.parser")
+            soup = BeautifulSoup(
+                response.text, "lxml", parse_only=_PAPER_STRAINER
+            )
 
             # Try the first format (paper-data class)
             paper_data = soup.find("div", {"class": "paper-data"})
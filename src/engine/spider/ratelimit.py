@@ -0,0 +1,93 @@
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+import requests
+
+# Requests per second allowed for each site, hosts not listed use the default
+DEFAULT_RATES = {
+    "dl.acm.org": 0.3,
+    "doi.org": 0.5,
+    "ieeexplore.ieee.org": 0.5,
+    "www.ndss-symposium.org": 0.5,
+    "www.usenix.org": 0.5,
+}
+DEFAULT_RATE = 0.5
+
+
+class HostRateLimiter:
+    """Thread-safe token bucket per host"""
+
+    def __init__(
+        self,
+        rate_per_sec: dict[str, float] | None = None,
+        default_rate: float = DEFAULT_RATE,
+        burst: int = 1,
+    ):
+        """
+        Initialize the limiter
+
+        Args:
+            rate_per_sec: Allowed requests per second keyed by host
+            default_rate: Rate for hosts missing from rate_per_sec
+            burst: Number of requests a host may issue back to back
+        """
+        self.rate_per_sec = dict(rate_per_sec or {})
+        self.default_rate = default_rate
+        self.burst = burst
+        self._lock = threading.Lock()
+        # host -> (available tokens, time of last refill)
+        self._buckets: dict[str, tuple[float, float]] = {}
+        # host -> time before which no request may start (Retry-After)
+        self._blocked_until: dict[str, float] = {}
+
+    def acquire(self, url: str) -> None:
+        """Block until a request to the host of the URL may be sent"""
+        host = urlparse(url).netloc
+        rate = self.rate_per_sec.get(host, self.default_rate)
+
+        with self._lock:
+            now = time.monotonic()
+            tokens, last = self._buckets.get(host, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - last) * rate)
+            # Take the token now, callers sleep until it has been refilled
+            tokens -= 1
+            wait = -tokens / rate if tokens < 0 else 0.0
+            wait = max(wait, self._blocked_until.get(host, 0.0) - now)
+            self._buckets[host] = (tokens, now)
+
+        if wait > 0:
+            time.sleep(wait)
+
+    def update_from_response(self, response: requests.Response) -> None:
+        """Pause the host of a throttled response for its Retry-After"""
+        if response.status_code not in (429, 503):
+            return
+        delay = parse_retry_after(response.headers.get("Retry-After"))
+        if delay is None:
+            return
+
+        host = urlparse(response.url).netloc
+        with self._lock:
+            blocked_until = time.monotonic() + delay
+            if blocked_until > self._blocked_until.get(host, 0.0):
+                self._blocked_until[host] = blocked_until
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Retry-After is either a number of seconds or an HTTP date"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+# Shared by all spiders so hosts are throttled across spider instances
+limiter = HostRateLimiter(DEFAULT_RATES)
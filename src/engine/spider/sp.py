@@ -1,27 +1,40 @@
 import json
 import re
-import time
 
-import cloudscraper
-from bs4 import BeautifulSoup
+import requests
+from bs4 import BeautifulSoup, SoupStrainer
 
 from .base_spider import BaseSpider
+from .http_client import get_with_challenge_fallback
+from .ratelimit import limiter
 from .utils import get_default_headers, retry_on_failure
 
+_METADATA_RE = re.compile(
+    r"xplGlobal\.document\.metadata=(\{.*?\});", re.DOTALL
+)
+_ABSTRACT_SEL = "div.abstract-text div.u-mb-1 div[xplmathjax]"
+_ABSTRACT_STRAINER = SoupStrainer(
+    "div", class_=re.compile(r"\babstract-text\b")
+)
+
 
 class SPSpider(BaseSpider):
     def __init__(self, conf: str):
         super().__init__(conf)
-        self.scraper = cloudscraper.create_scraper(
-            browser={
-                "browser": "chrome",
-                "platform": "windows",
-                "mobile": False,
-            }
-        )
-        self.scraper.headers.update(get_default_headers())
+        self.headers = get_default_headers()
+        # DOI -> resolved IEEE Xplore URL, lets retries skip the redirect
+        self._resolved_urls: dict[str, str] = {}
 
     @retry_on_failure(max_retries=3, delay=2.0)
+    def _fetch(self, url: str) -> requests.Response:
+        """Fetch a page, transient errors are retried by the decorator"""
+        limiter.acquire(url)
+        response = get_with_challenge_fallback(
+            url, headers=self.headers, allow_redirects=True
+        )
+        response.raise_for_status()
+        return response
+
     def get_paper_info(self, doi_url: str) -> dict[str, str] | None:
         """
         Extract abstract from IEEE S&P paper page
@@ -34,20 +47,14 @@ class SPSpider(BaseSpider):
         """
         try:
             self.logger.info(f"Fetching paper info from {doi_url}")
-            # First request to handle redirect
-            response = self.scraper.get(doi_url, allow_redirects=True)
-            time.sleep(2)
-
-            # Second request to actual page
-            response = self.scraper.get(response.url)
+            # Redirects are followed, so this lands on the actual page
+            url = self._resolved_urls.get(doi_url, doi_url)
+            response = self._fetch(url)
+            self._resolved_urls[doi_url] = response.url
 
             # Try to extract metadata JSON
             html_text = response.text
-            match = re.search(
-                r"xplGlobal\.document\.metadata=(\{.*?\});",
-                html_text,
-                re.DOTALL,
-            )
+            match = _METADATA_RE.search(html_text)
 
             if match:
                 metadata = json.loads(match.group(1))
@@ -59,10 +66,10 @@ class SPSpider(BaseSpider):
 
             # Fallback to HTML parsing
             self.logger.info("Falling back to HTML parsing")
-            soup = BeautifulSoup(response.text, "html.parser")
-            abstract_div = soup.select_one(
-                "div.abstract-text div.u-mb-1 div[xplmathjax]"
+            soup = BeautifulSoup(
+                html_text, "lxml", parse_only=_ABSTRACT_STRAINER
             )
+            abstract_div = soup.select_one(_ABSTRACT_SEL)
 
             if abstract_div:
                 self.logger.info("Successfully extracted abstract from HTML")
@@ -1,3 +1,5 @@
+from functools import cache
+
 from .base_spider import BaseSpider
 from .ccs import CCSSpider
 from .ndss import NDSSSpider
@@ -5,17 +7,24 @@ from .sp import SPSpider
 from .uss import USSSpider
 
 
+# Available spiders mapping
+SPIDER_CLASSES: dict[str, type[BaseSpider]] = {
+    "ccs": CCSSpider,
+    "ndss": NDSSSpider,
+    "sp": SPSpider,
+    "uss": USSSpider,
+}
+
+
+@cache
+def _get_spider(conference: str) -> BaseSpider:
+    """Create the spider of a conference once and reuse it afterwards"""
+    return SPIDER_CLASSES[conference](conference)
+
+
 class SpiderManager:
     """Manager class for all paper spiders"""
 
-    # Available spiders mapping
-    _spider_classes: dict[str, type[BaseSpider]] = {
-        "ccs": CCSSpider,
-        "ndss": NDSSSpider,
-        "sp": SPSpider,
-        "uss": USSSpider,
-    }
-
     def __init__(self, conference: str):
         """
         Initialize spider manager for specific conference
@@ -27,11 +36,11 @@ class SpiderManager:
             KeyError: If conference not supported
         """
         self.conference = conference.lower()
-        if self.conference not in self._spider_classes:
+        if self.conference not in SPIDER_CLASSES:
             raise KeyError(f"Conference '{conference}' not supported")
 
-        # Initialize the specific spider
-        self.spider = self._spider_classes[self.conference](self.conference)
+        # Spiders are shared, constructing a manager per paper is cheap
+        self.spider = _get_spider(self.conference)
 
     def get_paper_info(self, url: str) -> dict[str, str] | None:
         """
@@ -1,15 +1,26 @@
-from bs4 import BeautifulSoup
+import re
+
+from bs4 import BeautifulSoup, SoupStrainer
 
 from .base_spider import BaseSpider
 from .utils import retry_on_failure, safe_request
 
+# Only the abstract and PDF fields are needed, skip the rest of the page
+_FIELDS_STRAINER = SoupStrainer(
+    "div",
+    class_=re.compile(
+        r"\bfield-name-field-(paper-description|final-paper-pdf)\b"
+    ),
+)
+# Transient errors are retried here, get_paper_info turns the rest into None
+_fetch = retry_on_failure(max_retries=3, delay=2.0)(safe_request)
+
 
 class USSSpider(BaseSpider):
     def __init__(self, conf: str):
         super().__init__(conf)
         self.base_url = "https://www.usenix.org"
 
-    @retry_on_failure(max_retries=3, delay=2.0)
     def get_paper_info(self, url: str) -> dict[str, str] | None:
         """
         Extract abstract and PDF URL from a USENIX paper page
@@ -22,14 +33,16 @@ class USSSpider(BaseSpider):
         """
         try:
             self.logger.info(f"Fetching paper info from {url}")
-            response = safe_request(url)
+            response = _fetch(url)
             if response.status_code != 200:
                 self.logger.error(
                     f"Failed to fetch {url}, status code: {response.status_code}"
                 )
                 return None
 
-            soup = BeautifulSoup(response.text, "html.parser")
+            soup = BeautifulSoup(
+                response.text, "lxml", parse_only=_FIELDS_STRAINER
+            )
 
             # Extract abstract
             abstract_div = soup.find(
@@ -6,6 +6,9 @@ from typing import Any
 
 import requests
 
+from .http_client import DEFAULT_TIMEOUT, get_session
+from .ratelimit import limiter, parse_retry_after
+
 # 常用 User-Agent 列表
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
@@ -34,32 +37,36 @@ def retry_on_failure(
     max_retries: int = 3,
     delay: float = 1.0,
     backoff_factor: float = 2.0,
-    exceptions: tuple = (requests.RequestException, Exception),
+    exceptions: tuple = (requests.RequestException,),
+    max_delay: float = 60.0,
 ) -> Callable:
     """
-    装饰器：在发生异常时进行重试
+    装饰器：在发生暂时性异常时进行重试，指数退避并加随机抖动
+
+    连接错误、超时以及 429/5xx 响应会重试，其他 HTTP 错误直接抛出
 
     Args:
         max_retries: 最大重试次数
         delay: 初始延迟时间（秒）
         backoff_factor: 重试延迟的增长因子
         exceptions: 需要重试的异常类型
+        max_delay: 单次退避的上限（秒，不含抖动）
     """
 
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            current_delay = delay
             last_exception = None
 
             for attempt in range(max_retries):
                 try:
                     return func(*args, **kwargs)
                 except exceptions as e:
+                    if not _is_transient(e):
+                        raise
                     last_exception = e
                     if attempt < max_retries - 1:  # 不是最后一次尝试
-                        time.sleep(current_delay)
-                        current_delay *= backoff_factor
+                        time.sleep(_retry_delay(e, attempt))
                         continue
 
             # 所有重试都失败后，抛出最后一个异常
@@ -67,16 +74,40 @@ def retry_on_failure(
 
         return wrapper
 
+    def _retry_delay(error: Exception, attempt: int) -> float:
+        # 抖动避免并发的重试同时打到同一站点
+        sleep = min(max_delay, delay * backoff_factor**attempt)
+        sleep += random.uniform(0, delay)
+
+        # 被限流时至少等待服务器要求的 Retry-After
+        response = getattr(error, "response", None)
+        if response is not None and response.status_code in (429, 503):
+            limiter.update_from_response(response)
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None:
+                sleep = max(sleep, retry_after)
+        return sleep
+
     return decorator
 
 
+def _is_transient(error: Exception) -> bool:
+    """请求失败是否可能在重试后成功"""
+    response = getattr(error, "response", None)
+    if isinstance(error, requests.HTTPError) and response is not None:
+        return response.status_code == 429 or response.status_code >= 500
+    return True
+
+
 def safe_request(
     url: str,
     method: str = "GET",
     **kwargs: Any,
 ) -> requests.Response:
     """
-    发送安全的 HTTP 请求，带有重试机制和随机延迟
+    发送安全的 HTTP 请求，按站点限速，非 2xx 响应抛出 HTTPError
+
+    需要重试时用 retry_on_failure 包装
 
     Args:
         url: 请求的URL
@@ -88,9 +119,12 @@ def safe_request(
     default_headers = get_default_headers()
     default_headers.update(headers)
 
-    # 添加随机延迟
-    time.sleep(random.uniform(1, 3))
+    # 按站点限速
+    limiter.acquire(url)
 
-    response = requests.request(method, url, headers=default_headers, **kwargs)
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+    response = get_session().request(
+        method, url, headers=default_headers, **kwargs
+    )
     response.raise_for_status()
     return response
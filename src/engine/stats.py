@@ -1,7 +1,36 @@
-import json
+import os
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+import orjson
+import pandas as pd
+
+
+def _analyze_year_file(file: Path) -> tuple[str, int, int]:
+    """Count papers and missing abstracts in one year file."""
+    year = file.stem  # Get year from filename
+    total = 0
+    missing = 0
+    try:
+        papers = orjson.loads(file.read_bytes())
+
+        for paper in papers:
+            if paper["info"]["type"] != "Conference and Workshop Papers":
+                continue
+            total += 1
+            if (
+                "info" not in paper
+                or "abstract" not in paper["info"]
+                or paper["info"]["abstract"] is None
+            ):
+                missing += 1
+
+    except Exception as e:
+        print(f"Error processing {file}: {str(e)}")
+
+    return year, total, missing
+
 
 def analyze_conference_data(conf: str) -> dict:
     """Analyze abstract availability for a conference."""
@@ -12,47 +41,45 @@ def analyze_conference_data(conf: str) -> dict:
         print(f"Directory not found: {conf_dir}")
         return {}
 
-    for file in sorted(conf_dir.glob("*.json")):
-        year = file.stem  # Get year from filename
-        try:
-            with open(file) as f:
-                papers = json.load(f)
-
-            for paper in papers:
-                if paper["info"]["type"] != "Conference and Workshop Papers":
-                    continue
-                stats[year]["total"] += 1
-                if (
-                    "info" not in paper
-                    or "abstract" not in paper["info"]
-                    or paper["info"]["abstract"] is None
-                ):
-                    stats[year]["missing_abstract"] += 1
-
-        except Exception as e:
-            print(f"Error processing {file}: {str(e)}")
+    files = sorted(conf_dir.glob("*.json"))
+    if not files:
+        return stats
+
+    # Year files are independent, decode them on all cores
+    max_workers = min(os.cpu_count() or 1, len(files))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for year, total, missing in executor.map(
+            _analyze_year_file, files, chunksize=4
+        ):
+            if not total:
+                continue
+            stats[year]["total"] += total
+            stats[year]["missing_abstract"] += missing
 
     return stats
 
 
 def print_summary_table(all_stats: dict):
     """Print a summary table of missing abstracts."""
-    print("\n=== Missing Abstracts Summary ===")
-    print(
-        f"{'Conf':<6} {'Year':<6} {'Missing':<8} {'Total':<8} {'Percentage':<10}"
+    df = pd.DataFrame(
+        [
+            (conf, year, counts["missing_abstract"], counts["total"])
+            for conf, stats in all_stats.items()
+            for year, counts in stats.items()
+        ],
+        columns=["Conf", "Year", "Missing", "Total"],
+    )
+    df["Percentage"] = (
+        (df["Missing"] / df["Total"].where(df["Total"] > 0) * 100)
+        .fillna(0)
+        .map("{:.1f}%".format)
     )
-    print("-" * 40)
 
     # Sort by conference and year
-    for conf in sorted(all_stats.keys()):
-        for year in sorted(all_stats[conf].keys(), reverse=True):
-            total = all_stats[conf][year]["total"]
-            missing = all_stats[conf][year]["missing_abstract"]
-            # if missing > 0:  # Only show years with missing abstracts
-            percentage = (missing / total * 100) if total > 0 else 0
-            print(
-                f"{conf:<6} {year:<6} {missing:<8} {total:<8} {percentage:.1f}%"
-            )
+    df = df.sort_values(["Conf", "Year"], ascending=[True, False])
+
+    print("\n=== Missing Abstracts Summary ===")
+    print(df.to_string(index=False))
 
 
 def main():
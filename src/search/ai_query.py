@@ -1,31 +1,147 @@
 import argparse
+import asyncio
 import hashlib
-import json
+import math
+import os
+import sqlite3
+import sys
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
 from pathlib import Path
 from typing import Any
 
 import datasets
+import httpx
+import ijson
 import instructor
-from openai import OpenAI, OpenAIError
+import numpy as np
+import orjson
+from instructor.exceptions import InstructorRetryException
+from openai import AsyncOpenAI, OpenAI, OpenAIError
 from pydantic import BaseModel
+from tenacity import (
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_random_exponential,
+)
 from tqdm import tqdm
 
-from src.search.config import InstructorConfig, OpenaiConfig
-from src.search.utils import call_llm
+from src.search.config import (
+    EmbeddingConfig,
+    InstructorConfig,
+    ModelConfig,
+    OpenaiConfig,
+    PromptConfig,
+)
+from src.search.utils import is_transient
 
+_CONFERENCE_TYPE = "Conference and Workshop Papers"
 
-class RelevanceCheck(BaseModel):
-    relevant: bool
+
+def _title_digest(title: str) -> int:
+    """Stable 64-bit digest of a title, used to track processed papers"""
+    return int.from_bytes(
+        hashlib.blake2b(title.encode(), digest_size=8).digest(), "little"
+    )
+
+
+class RelevanceBatch(BaseModel):
+    results: list[bool]
+
+
+class RelevanceCache:
+    """SQLite store of LLM relevance judgments keyed by (query, paper)"""
+
+    def __init__(self, db_path: Path):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rel ("
+            "qkey TEXT, pkey TEXT, val INT, PRIMARY KEY (qkey, pkey))"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def query_key(query: str) -> str:
+        return hashlib.sha256(query.encode()).hexdigest()
+
+    def get_many(self, qkey: str, pkeys: list[str]) -> dict[str, bool]:
+        """Return the cached judgments found for the given papers"""
+        placeholders = ",".join("?" * len(pkeys))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT pkey, val FROM rel WHERE qkey = ? "
+                f"AND pkey IN ({placeholders})",
+                [qkey, *pkeys],
+            ).fetchall()
+        return {pkey: bool(val) for pkey, val in rows}
+
+    def set_many(self, qkey: str, judgments: dict[str, bool]) -> None:
+        """Store the judgments of a batch in one transaction"""
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO rel (qkey, pkey, val) VALUES (?, ?, ?)",
+                [(qkey, pkey, int(val)) for pkey, val in judgments.items()],
+            )
+            self._conn.commit()
+
+
+def _parse_year_file(year_file: Path) -> list[dict[str, Any]]:
+    """Parse one conference year file into projected paper records"""
+    # Every record of the file shares one interned conf and year string
+    conf = sys.intern(year_file.parent.name)
+    year = sys.intern(year_file.stem)
+    papers = []
+    try:
+        # Stream papers, only the projected fields are kept
+        with open(year_file, "rb") as f:
+            for paper in ijson.items(f, "item"):
+                info = paper["info"]
+                if info["type"] != _CONFERENCE_TYPE:
+                    continue
+                papers.append(
+                    {
+                        "title": info.get("title", ""),
+                        "abstract": info.get("abstract", ""),
+                        "year": year,
+                        "conf": conf,
+                        "url": info.get("ee", ""),
+                        "key": info.get("key", ""),
+                        "keywords": info.get("keywords", []),
+                    }
+                )
+    except Exception as e:
+        print(f"Error loading {year_file}: {e}")
+    return papers
+
+
+def _should_retry(error: BaseException) -> bool:
+    """Retry transient API errors and responses that failed validation"""
+    if isinstance(error, InstructorRetryException):
+        return True
+    return isinstance(error, OpenAIError) and is_transient(error)
 
 
 class PaperSemanticSearch:
+    SYSTEM_PROMPT = """You are an assistant that analyzes the relevance of academic papers based on their titles and abstracts. Your task is to determine whether each of the given numbered papers is relevant to specific user-provided keywords or queries. Ensure a comprehensive understanding of both the paper content and the keywords/query before making a judgment. Base your judgment solely on the content of the paper title and abstract without referencing external information.
+                Return one boolean per paper, in order:
+                    - true if paper i is relevant
+                    - false if it's not relevant"""
+    _SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_PROMPT}
+
     def __init__(
         self,
         enriched_dir: str = "data/enriched",
         cache_dir: str = "data/cache",
         max_workers: int = 5,
+        batch_size: int = 10,
+        prefilter_ratio: float | None = None,
+        min_candidates: int = 50,
     ):
         """
         Initialize the semantic search engine
@@ -33,130 +149,333 @@ class PaperSemanticSearch:
         Args:
             enriched_dir: Path to the enriched data directory
             cache_dir: Path to cache directory for storing search results
-            max_workers: Maximum number of concurrent threads
+            max_workers: Maximum number of concurrent LLM requests
+            batch_size: Number of papers judged per LLM request
+            prefilter_ratio: Fraction of papers, ranked by embedding
+                similarity to the query, sent to the LLM (None, the
+                default, sends every paper)
+            min_candidates: Papers always sent to the LLM when prefiltering
         """
         self.enriched_dir = Path(enriched_dir)
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.max_workers = max_workers
+        self.batch_size = batch_size
+        self.prefilter_ratio = prefilter_ratio
+        self.min_candidates = min_candidates
+        self.relevance_cache = RelevanceCache(self.cache_dir / "relevance.db")
+        # Arrow copy of the parsed corpus, memory-mapped on later runs
+        self.corpus_cache = self.cache_dir / "corpus.arrow"
         self.dataset = self._load_dataset()
+        self._by_key = self._build_index()
+        # Corpus embeddings are computed on the first prefiltered search
+        self._embeddings: np.ndarray | None = None
+        # Set once embedding the corpus failed, so it is not retried per query
+        self._embeddings_failed = False
+        self._embeddings_lock = threading.Lock()
+        self._embedding_client: OpenAI | None = None
+        # Last embedded query, a search runs once per year with one query
+        self._query_embedding: tuple[str, np.ndarray] | None = None
+        self._embedding_client_lock = threading.Lock()
 
     def _load_dataset(self) -> datasets.Dataset:
         """Load and preprocess papers from enriched data"""
-        papers = []
-
-        # Load papers from all conferences
-        for conf_dir in self.enriched_dir.iterdir():
-            if not conf_dir.is_dir():
-                continue
+        # Collect the year files of all conferences, then parse in parallel
+        year_files = [
+            year_file
+            for conf_dir in self.enriched_dir.iterdir()
+            if conf_dir.is_dir()
+            for year_file in conf_dir.glob("*.json")
+        ]
+        if not year_files:
+            return datasets.Dataset.from_list([])
 
-            conf = conf_dir.name
-            for year_file in conf_dir.glob("*.json"):
-                year = year_file.stem
-                try:
-                    with open(year_file) as f:
-                        data = json.load(f)
-                        for paper in data:
-                            if (
-                                paper["info"]["type"]
-                                != "Conference and Workshop Papers"
-                            ):
-                                continue
-                            papers.append(
-                                {
-                                    "title": paper["info"].get("title", ""),
-                                    "abstract": paper["info"].get(
-                                        "abstract", ""
-                                    ),
-                                    "year": year,
-                                    "conf": conf,
-                                    "url": paper["info"].get("ee", ""),
-                                    "key": paper["info"].get("key", ""),
-                                    "keywords": paper["info"].get(
-                                        "keywords", []
-                                    ),
-                                }
-                            )
-                except Exception as e:
-                    print(f"Error loading {year_file}: {e}")
+        # Conference directory mtimes also catch added or removed files
+        source_mtime = max(
+            path.stat().st_mtime
+            for path in [*year_files, *{f.parent for f in year_files}]
+        )
+        state_path = self.corpus_cache / "state.json"
+        if state_path.exists() and state_path.stat().st_mtime >= source_mtime:
+            try:
+                return datasets.load_from_disk(str(self.corpus_cache))
+            except Exception as e:
+                print(f"Error loading corpus cache: {e}")
 
-        return datasets.Dataset.from_list(papers)
+        max_workers = min(os.cpu_count() or 1, len(year_files))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            papers = list(
+                chain.from_iterable(
+                    executor.map(_parse_year_file, year_files, chunksize=4)
+                )
+            )
 
-    def _filter_dataset(
+        dataset = datasets.Dataset.from_list(papers)
+        try:
+            dataset.save_to_disk(str(self.corpus_cache))
+        except Exception as e:
+            print(f"Error saving corpus cache: {e}")
+        return dataset
+
+    def _build_index(self) -> dict[tuple[str, str], list[int]]:
+        """Map (conference, year) to the dataset rows of those papers"""
+        if not len(self.dataset):
+            return {}
+        by_key = defaultdict(list)
+        for i, key in enumerate(
+            zip(self.dataset["conf"], self.dataset["year"])
+        ):
+            by_key[key].append(i)
+        return dict(by_key)
+
+    def _filter_indices(
         self, conference: str | None = None, year: str | None = None
-    ) -> datasets.Dataset:
-        """Filter dataset by conference and year"""
-        filtered = self.dataset
-        if conference:
-            filtered = filtered.filter(lambda x: x["conf"] == conference)
-        if year:
-            filtered = filtered.filter(lambda x: x["year"] == year)
-        return filtered
+    ) -> list[int]:
+        """Get the dataset rows matching conference and year"""
+        if not conference and not year:
+            return list(range(len(self.dataset)))
+
+        return sorted(
+            i
+            for (conf, paper_year), rows in self._by_key.items()
+            if (not conference or conf == conference)
+            and (not year or paper_year == year)
+            for i in rows
+        )
+
+    def _get_embedding_client(self) -> OpenAI:
+        """Return the client shared by all embedding requests"""
+        if self._embedding_client is None:
+            with self._embedding_client_lock:
+                if self._embedding_client is None:
+                    self._embedding_client = OpenAI(
+                        base_url=OpenaiConfig.base_url,
+                        api_key=OpenaiConfig.api_key,
+                        http_client=httpx.Client(http2=True),
+                    )
+        return self._embedding_client
+
+    def _embed_texts(self, texts: list[str]) -> np.ndarray:
+        """Embed texts into unit-length float16 vectors"""
+        client = self._get_embedding_client()
+        vectors = []
+        for start in range(0, len(texts), 256):
+            response = client.embeddings.create(
+                model=EmbeddingConfig.model_name,
+                input=texts[start : start + 256],
+            )
+            vectors.extend(item.embedding for item in response.data)
+
+        embeddings = np.asarray(vectors, dtype=np.float32)
+        embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True) + 1e-12
+        return embeddings.astype(np.float16)
+
+    def _get_embeddings(self) -> np.ndarray | None:
+        """Load or compute the embeddings of every paper in the dataset"""
+        with self._embeddings_lock:
+            if self._embeddings is not None or self._embeddings_failed:
+                return self._embeddings
+
+            # Stored next to the Arrow corpus and rebuilt along with it
+            cache_path = self.corpus_cache / "embeddings.npy"
+            meta_path = self.corpus_cache / "embeddings.json"
+            state_path = self.corpus_cache / "state.json"
+            embeddings = self._load_embeddings(
+                cache_path, meta_path, state_path
+            )
+            if embeddings is not None:
+                self._embeddings = embeddings
+                return embeddings
+
+            try:
+                texts = [
+                    f"{title}\n{abstract or ''}"
+                    for title, abstract in zip(
+                        self.dataset["title"], self.dataset["abstract"]
+                    )
+                ]
+                embeddings = self._embed_texts(texts)
+            except Exception as e:
+                print(f"Error embedding corpus, prefilter disabled: {e}")
+                self._embeddings_failed = True
+                return None
+
+            try:
+                self.corpus_cache.mkdir(parents=True, exist_ok=True)
+                np.save(cache_path, embeddings)
+                meta_path.write_bytes(
+                    orjson.dumps(
+                        {
+                            "model": EmbeddingConfig.model_name,
+                            "dim": embeddings.shape[1],
+                            "rows": embeddings.shape[0],
+                        }
+                    )
+                )
+            except OSError as e:
+                print(f"Error saving embeddings cache: {e}")
+            self._embeddings = embeddings
+            return embeddings
+
+    def _load_embeddings(
+        self, cache_path: Path, meta_path: Path, state_path: Path
+    ) -> np.ndarray | None:
+        """Load cached embeddings if they match the model and the corpus"""
+        if not cache_path.exists() or not meta_path.exists():
+            return None
+        # A corpus saved after the embeddings may hold different papers
+        if (
+            state_path.exists()
+            and cache_path.stat().st_mtime < state_path.stat().st_mtime
+        ):
+            return None
+        try:
+            meta = orjson.loads(meta_path.read_bytes())
+            embeddings = np.load(cache_path, mmap_mode="r")
+        except (OSError, ValueError) as e:
+            print(f"Error loading embeddings cache: {e}")
+            return None
+
+        if (
+            meta.get("model") != EmbeddingConfig.model_name
+            or embeddings.ndim != 2
+            or meta.get("dim") != embeddings.shape[1]
+            or embeddings.shape[0] != len(self.dataset)
+        ):
+            return None
+        return embeddings
+
+    def _embed_query(self, query: str) -> np.ndarray:
+        """Embed a query, reusing the vector of the previous call"""
+        cached = self._query_embedding
+        if cached is not None and cached[0] == query:
+            return cached[1]
+        embedding = self._embed_texts([query])[0]
+        self._query_embedding = (query, embedding)
+        return embedding
+
+    def _prefilter(self, query: str, indices: list[int]) -> list[int]:
+        """Keep only the rows most similar to the query for the LLM check"""
+        if not self.prefilter_ratio or self.prefilter_ratio >= 1:
+            return indices
+
+        k = max(
+            self.min_candidates, math.ceil(len(indices) * self.prefilter_ratio)
+        )
+        if k >= len(indices):
+            return indices
+
+        embeddings = self._get_embeddings()
+        if embeddings is None:
+            return indices
+        try:
+            query_embedding = self._embed_query(query)
+        except Exception as e:
+            print(f"Error embedding query, prefilter skipped: {e}")
+            return indices
+        if query_embedding.shape[0] != embeddings.shape[1]:
+            print("Embedding dimensions differ, prefilter skipped")
+            return indices
+
+        # float16 storage halves memory, score in float32 for BLAS
+        candidates = embeddings[indices].astype(np.float32)
+        scores = candidates @ query_embedding.astype(np.float32)
+        top = np.argpartition(-scores, k - 1)[:k]
+        return sorted(indices[i] for i in top)
 
     def _get_paper_content(self, paper: dict[str, Any]) -> str:
         """Get formatted paper content for comparison"""
+        # The opening of an abstract is enough to judge relevance, long ones
+        # only add input tokens
+        abstract = (paper.get("abstract") or "N/A")[
+            : PromptConfig.max_abstract_chars
+        ]
         return f"""Title: {paper["title"]}
-                Abstract: {paper.get("abstract", "N/A")}"""
-
-    def _extract_relevance_check(self, prompt: str) -> RelevanceCheck:
-        client = instructor.from_openai(
-            OpenAI(base_url=OpenaiConfig.base_url, api_key=OpenaiConfig.api_key)
+                Abstract: {abstract}"""
+
+    def _create_client(self) -> AsyncOpenAI:
+        """Create the client shared by all requests of one search run"""
+        return AsyncOpenAI(
+            base_url=OpenaiConfig.base_url,
+            api_key=OpenaiConfig.api_key,
+            # Retries are handled by _request_relevance
+            max_retries=0,
+            # HTTP/2 multiplexes concurrent requests over one connection
+            http_client=httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(
+                    max_connections=self.max_workers * 2,
+                    max_keepalive_connections=self.max_workers,
+                ),
+            ),
         )
 
-        response = client.chat.completions.create(
+    # Randomized exponential backoff keeps tasks from retrying in lock-step
+    @retry(
+        wait=wait_random_exponential(multiplier=1, max=60),
+        stop=stop_after_attempt(6),
+        retry=retry_if_exception(_should_retry),
+        reraise=True,
+    )
+    async def _request_relevance(
+        self,
+        client: instructor.AsyncInstructor,
+        messages: list[dict[str, str]],
+    ) -> RelevanceBatch:
+        # One structured call answers the whole batch
+        return await client.chat.completions.create(
             model=InstructorConfig.model_name,
-            response_model=RelevanceCheck,
-            messages=[{"role": "user", "content": prompt}],
+            response_model=RelevanceBatch,
+            messages=messages,
+            temperature=ModelConfig.temperature,
         )
-        return response
 
-    def _check_relevance(
-        self, query: str, paper_content: str, max_retries: int = 3
-    ) -> RelevanceCheck | None:
+    async def _check_relevance(
+        self,
+        client: instructor.AsyncInstructor,
+        query: str,
+        paper_contents: list[str],
+    ) -> list[bool] | None:
         """
-        Use LLM to check if a paper is relevant to the query
+        Use LLM to check which papers of a batch are relevant to the query
 
         Args:
+            client: Instructor client of the current search run
             query: Search query
-            paper_content: Paper content to check
-            max_retries: Maximum number of retry attempts for API calls
+            paper_contents: Contents of the papers to check
 
         Returns:
-            RelevanceCheck object if successful, None if failed after retries
+            One relevance flag per paper if successful, None if failed
         """
+        papers = "\n\n".join(
+            f"[{i}] {content}" for i, content in enumerate(paper_contents, 1)
+        )
+        # The shared system message comes first so providers can reuse the
+        # cached prefix across requests
         messages = [
-            {
-                "role": "system",
-                "content": """You are an assistant that analyzes the relevance of academic papers based on their titles and abstracts. Your task is to determine whether a given paper is relevant to specific user-provided keywords or queries. Ensure a comprehensive understanding of both the paper content and the keywords/query before making a judgment. Base your judgment solely on the content of the paper title and abstract without referencing external information. 
-                Respond with:
-                    - 'yes' if the paper is relevant
-                    - 'no' if it's not relevant""",
-            },
+            self._SYSTEM_MESSAGE,
             {
                 "role": "user",
-                "content": f"{paper_content}\nUser Keywords/Query: {query}",
+                "content": f"{papers}\nUser Keywords/Query: {query}",
             },
         ]
 
-        for attempt in range(max_retries):
-            try:
-                response = call_llm(messages=messages)
-                return self._extract_relevance_check(response)
-            except OpenAIError as e:
-                if attempt < max_retries - 1:
-                    wait_time = (attempt + 1) * 2  # Exponential backoff
-                    print(
-                        f"OpenAI API error: {str(e)}. Retrying in {wait_time}s..."
-                    )
-                    time.sleep(wait_time)
-                else:
-                    print(
-                        f"Failed to check relevance after {max_retries} attempts: {str(e)}"
-                    )
-                    return None
-            except Exception as e:
-                print(f"Unexpected error checking relevance: {str(e)}")
-                return None
+        try:
+            batch = await self._request_relevance(client, messages)
+        except (OpenAIError, InstructorRetryException) as e:
+            print(f"Failed to check relevance after retries: {str(e)}")
+            return None
+        except Exception as e:
+            print(f"Unexpected error checking relevance: {str(e)}")
+            return None
+
+        if len(batch.results) != len(paper_contents):
+            print(
+                f"Expected {len(paper_contents)} relevance results, "
+                f"got {len(batch.results)}"
+            )
+            return None
+        return batch.results
 
     def _get_cache_path(
         self, query: str, conference: str | None = None, year: str | None = None
@@ -169,8 +488,31 @@ class PaperSemanticSearch:
         if year:
             cache_key += f"_year={year}"
 
-        cache_key = hashlib.md5(cache_key.encode()).hexdigest()
-        return self.cache_dir / f"{cache_key}.json"
+        cache_path = self.cache_dir / f"{self._hash_key(cache_key)}.json"
+        self._migrate_legacy_path(
+            self.cache_dir / f"{self._legacy_hash_key(cache_key)}.json",
+            cache_path,
+        )
+        return cache_path
+
+    @staticmethod
+    def _hash_key(text: str) -> str:
+        """Hash a cache key into a 32 character file name"""
+        return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+    @staticmethod
+    def _legacy_hash_key(text: str) -> str:
+        """File name used for the key before the switch to BLAKE2"""
+        return hashlib.md5(text.encode(), usedforsecurity=False).hexdigest()
+
+    @staticmethod
+    def _migrate_legacy_path(legacy_path: Path, path: Path) -> None:
+        """Move a result stored under its MD5 name to its new name"""
+        if legacy_path.exists() and not path.exists():
+            try:
+                os.replace(legacy_path, path)
+            except OSError as e:
+                print(f"Error migrating {legacy_path}: {e}")
 
     def _get_output_dir(
         self,
@@ -182,23 +524,31 @@ class PaperSemanticSearch:
         Returns:
             output_dir
         """
-        cache_key = hashlib.md5(f"{query}".encode()).hexdigest()
-
-        base_output_dir = Path(base_dir) / cache_key
+        base_output_dir = Path(base_dir) / self._hash_key(query)
+        self._migrate_legacy_path(
+            Path(base_dir) / self._legacy_hash_key(query), base_output_dir
+        )
         base_output_dir.mkdir(parents=True, exist_ok=True)
 
         # result dir
         result_dir = base_output_dir / "results"
         result_dir.mkdir(parents=True, exist_ok=True)
 
-        # Create metadata file
+        # Create metadata file, kept as is when it already describes the query
         metadata_path = base_output_dir / "metadata.json"
+        try:
+            if orjson.loads(metadata_path.read_bytes()).get("query") == query:
+                return base_output_dir, result_dir
+        except (OSError, orjson.JSONDecodeError, AttributeError):
+            pass
+
         metadata = {
             "query": query,
             "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
         }
-        with open(metadata_path, "w") as f:
-            json.dump(metadata, f, indent=4)
+        metadata_path.write_bytes(
+            orjson.dumps(metadata, option=orjson.OPT_INDENT_2)
+        )
 
         return base_output_dir, result_dir
 
@@ -219,23 +569,35 @@ class PaperSemanticSearch:
         output_path = output_dir / filename
 
         # Save results to jsonl
-        with open(output_path, "w") as f:
+        with open(output_path, "wb") as f:
             for paper in results:
-                f.write(json.dumps(paper) + "\n")
+                f.write(orjson.dumps(paper) + b"\n")
 
         return output_path
 
     def _concat_results(self, output_dir: Path) -> Path:
         """Concatenate results from all files in the output directory"""
         concat_path = output_dir / "all_results.jsonl"
-        with open(concat_path, "w") as outfile:
+        with open(concat_path, "wb") as outfile:
             for file_path in output_dir.glob("*.jsonl"):
                 if file_path != concat_path:  # Skip the concat file itself
-                    with open(file_path) as infile:
-                        for line in infile:
-                            outfile.write(line)
+                    outfile.write(file_path.read_bytes())
         return concat_path
 
+    @staticmethod
+    def _read_jsonl(path: Path) -> list[Any]:
+        """Read a JSON lines file, skipping a line cut short by a crash"""
+        if not path.exists():
+            return []
+        items = []
+        with open(path, "rb") as f:
+            for line in f:
+                try:
+                    items.append(orjson.loads(line))
+                except orjson.JSONDecodeError:
+                    continue
+        return items
+
     def search(
         self,
         query: str,
@@ -258,91 +620,179 @@ class PaperSemanticSearch:
             List of relevant papers
         """
         cache_path = self._get_cache_path(query, conference, year)
-        partial_path = cache_path.with_suffix(".partial.json")
+        # Progress is appended as JSON lines so each batch only writes its
+        # own results instead of rewriting everything found so far. Processed
+        # papers are kept as 64-bit title digests rather than full titles
+        partial_path = cache_path.with_suffix(".partial.jsonl")
+        processed_path = cache_path.with_suffix(".processed.jsonl")
 
         # Try to load from cache first
         if use_cache and cache_path.exists():
-            with open(cache_path) as f:
-                return json.load(f)
+            return orjson.loads(cache_path.read_bytes())
 
         # Try to load partial results if they exist
-        processed_papers = set()
+        processed_papers: set[int] = set()
         relevant_papers = []
-        if save_partial and partial_path.exists():
+        if save_partial and processed_path.exists():
             try:
-                with open(partial_path) as f:
-                    partial_data = json.load(f)
-                    relevant_papers = partial_data["results"]
-                    processed_papers = set(partial_data["processed"])
+                processed_papers = set(self._read_jsonl(processed_path))
+                # Results of a batch whose digests were not recorded are
+                # dropped, the batch is checked again
+                relevant_papers = [
+                    paper
+                    for paper in self._read_jsonl(partial_path)
+                    if _title_digest(paper["title"]) in processed_papers
+                ]
                 print(
                     f"Loaded {len(relevant_papers)} papers from partial results"
                 )
             except Exception as e:
                 print(f"Error loading partial results: {str(e)}")
+                processed_papers = set()
+                relevant_papers = []
+
+        # Filter dataset based on conference and year, then drop papers
+        # far from the query before paying for LLM checks
+        indices = self._filter_indices(conference, year)
+        indices = self._prefilter(query, indices)
+        # Rows are read from Arrow as batches are scheduled, not up front
+        selected = self.dataset.select(indices)
+
+        qkey = self.relevance_cache.query_key(query)
+
+        def paper_key(paper: dict[str, Any]) -> str:
+            return paper.get("key") or paper["title"]
+
+        async def process_batch(
+            client: instructor.AsyncInstructor, batch: list[dict[str, Any]]
+        ) -> list[dict[str, Any]]:
+            # Papers judged for this query before skip the LLM
+            judgments = self.relevance_cache.get_many(
+                qkey, [paper_key(p) for p in batch]
+            )
+            uncached = [p for p in batch if paper_key(p) not in judgments]
 
-        # Filter dataset based on conference and year
-        filtered_dataset = self._filter_dataset(conference, year)
-        papers_list = list(filtered_dataset)
-
-        def process_paper(paper):
-            if paper["title"] in processed_papers:
-                return None
+            if uncached:
+                paper_contents = [self._get_paper_content(p) for p in uncached]
+                try:
+                    relevance = await self._check_relevance(
+                        client, query, paper_contents
+                    )
+                except Exception as e:
+                    print(f"Error processing batch: {str(e)}")
+                    relevance = None
 
-            paper_content = self._get_paper_content(paper)
-            try:
-                result = self._check_relevance(query, paper_content)
-                if result and result.relevant:
-                    return {
-                        "title": paper.get("title", "N/A"),
-                        "abstract": paper.get("abstract", "N/A"),
-                        "year": paper.get("year", "N/A"),
-                        "conf": paper.get("conf", "N/A"),
-                        "url": paper.get("url", "N/A"),
-                        "key": paper.get("key", "N/A"),
-                        "keywords": paper.get("keywords", []),
+                if relevance is not None:
+                    new_judgments = {
+                        paper_key(paper): relevant
+                        for paper, relevant in zip(uncached, relevance)
                     }
-            except Exception as e:
-                print(
-                    f"Error processing paper {paper.get('title', 'Unknown')}: {str(e)}"
-                )
-            return None
-
-        save_interval = 10  # Save partial results every 10 papers
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            future_to_paper = {
-                executor.submit(process_paper, paper): paper
-                for paper in papers_list
-            }
-
-            with tqdm(total=len(papers_list), desc="Searching papers") as pbar:
-                completed = 0
-                for future in as_completed(future_to_paper):
-                    paper = future_to_paper[future]
+                    self.relevance_cache.set_many(qkey, new_judgments)
+                    judgments.update(new_judgments)
+
+            return [
+                {
+                    "title": paper.get("title", "N/A"),
+                    "abstract": paper.get("abstract", "N/A"),
+                    "year": paper.get("year", "N/A"),
+                    "conf": paper.get("conf", "N/A"),
+                    "url": paper.get("url", "N/A"),
+                    "key": paper.get("key", "N/A"),
+                    "keywords": paper.get("keywords", []),
+                }
+                for paper in batch
+                if judgments.get(paper_key(paper))
+            ]
+
+        def iter_batches(pbar: tqdm):
+            """Yield batches of unprocessed papers, reading rows lazily"""
+            batch = []
+            for paper in selected:
+                if _title_digest(paper["title"]) in processed_papers:
+                    pbar.update(1)
+                    continue
+                # Several papers share one LLM request
+                batch.append(paper)
+                if len(batch) == self.batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+
+        async def run_batches() -> None:
+            openai_client = self._create_client()
+            client = instructor.from_openai(openai_client)
+            # Bounds the requests in flight, like the old thread pool size
+            semaphore = asyncio.Semaphore(self.max_workers)
+            # Bounds the batches read from the dataset but not yet finished
+            max_pending = 4 * self.max_workers
+
+            async def bounded(
+                batch: list[dict[str, Any]],
+            ) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+                async with semaphore:
                     try:
-                        result = future.result()
-                        if result:
-                            relevant_papers.append(result)
-                        processed_papers.add(paper["title"])
-
-                        # Save partial results periodically
-                        completed += 1
-                        if save_partial and completed % save_interval == 0:
-                            partial_data = {
-                                "results": relevant_papers,
-                                "processed": list(processed_papers),
-                            }
-                            with open(partial_path, "w") as f:
-                                json.dump(partial_data, f, indent=4)
+                        return batch, await process_batch(client, batch)
                     except Exception as e:
-                        print(f"Error processing future: {str(e)}")
-                    pbar.update(1)
+                        print(f"Error processing batch: {str(e)}")
+                        return batch, []
+
+            def record(
+                batch: list[dict[str, Any]], results: list[dict[str, Any]]
+            ) -> None:
+                relevant_papers.extend(results)
+                digests = [_title_digest(p["title"]) for p in batch]
+                processed_papers.update(digests)
+
+                # Append the batch, results before title digests so a
+                # recorded paper always has its results on disk
+                if save_partial:
+                    partial_file.writelines(
+                        orjson.dumps(paper) + b"\n" for paper in results
+                    )
+                    partial_file.flush()
+                    processed_file.writelines(
+                        b"%d\n" % digest for digest in digests
+                    )
+                    processed_file.flush()
+                pbar.update(len(batch))
 
-        # Save final results and clean up partial file
-        with open(cache_path, "w") as f:
-            json.dump(relevant_papers, f, indent=4)
+            async def drain(tasks: set[asyncio.Task]) -> set[asyncio.Task]:
+                done, tasks = await asyncio.wait(
+                    tasks, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    record(*task.result())
+                return tasks
 
-        if save_partial and partial_path.exists():
-            partial_path.unlink()  # Remove partial results file
+            if save_partial:
+                partial_file = open(partial_path, "ab")
+                processed_file = open(processed_path, "ab")
+            try:
+                with tqdm(total=len(selected), desc="Searching papers") as pbar:
+                    tasks: set[asyncio.Task] = set()
+                    for batch in iter_batches(pbar):
+                        if len(tasks) >= max_pending:
+                            tasks = await drain(tasks)
+                        tasks.add(asyncio.create_task(bounded(batch)))
+                    while tasks:
+                        tasks = await drain(tasks)
+            finally:
+                if save_partial:
+                    partial_file.close()
+                    processed_file.close()
+                await openai_client.close()
+
+        asyncio.run(run_batches())
+
+        # Save final results atomically and clean up partial files
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_bytes(orjson.dumps(relevant_papers))
+        os.replace(tmp_path, cache_path)
+
+        if save_partial:
+            partial_path.unlink(missing_ok=True)
+            processed_path.unlink(missing_ok=True)
 
         return relevant_papers
 
@@ -357,6 +807,8 @@ class PaperSearchRunner:
         max_workers: int = 10,
         use_cache: bool = True,
         save_partial: bool = True,
+        searcher: PaperSemanticSearch | None = None,
+        prefilter_ratio: float | None = None,
     ):
         """
         Initialize the paper search runner
@@ -369,6 +821,9 @@ class PaperSearchRunner:
             max_workers: Maximum number of concurrent threads
             use_cache: Whether to use cached results
             save_partial: Whether to save partial results
+            searcher: Optional preloaded search engine to reuse
+            prefilter_ratio: Fraction of papers sent to the LLM after an
+                embedding prefilter, ignored when searcher is given
         """
         self.query = query
         self.conference = conference
@@ -378,7 +833,9 @@ class PaperSearchRunner:
         self.save_partial = save_partial
         self.output_dir = output_dir
 
-        self.searcher = PaperSemanticSearch(max_workers=max_workers)
+        self.searcher = searcher or PaperSemanticSearch(
+            max_workers=max_workers, prefilter_ratio=prefilter_ratio
+        )
 
     def _parse_years(self, years_str: str | None) -> list[int]:
         """Parse years string into a list of years"""
@@ -475,6 +932,12 @@ def main():
         default=10,
         help="Maximum number of concurrent threads",
     )
+    parser.add_argument(
+        "--prefilter-ratio",
+        type=float,
+        help="Optional: Only send this fraction of papers most similar to the "
+        "query, by embedding, to the LLM",
+    )
     parser.add_argument(
         "--no-cache", action="store_true", help="Disable using cached results"
     )
@@ -494,6 +957,7 @@ def main():
         max_workers=args.max_workers,
         use_cache=not args.no_cache,
         save_partial=args.save_partial,
+        prefilter_ratio=args.prefilter_ratio,
     )
 
     runner.run()
@@ -13,3 +13,18 @@ class AisuiteConfig:
 
 class InstructorConfig:
     model_name: str = "gpt-4o-mini"
+
+
+class EmbeddingConfig:
+    model_name: str = "text-embedding-3-small"
+
+
+class PromptConfig:
+    # Abstracts are cut to this many characters before being sent to the LLM
+    max_abstract_chars: int = 1500
+
+
+class RateLimitConfig:
+    # Client side limits for LLM calls, set them to the provider's quota
+    requests_per_minute: int = 500
+    tokens_per_minute: int = 200_000
@@ -1,75 +1,482 @@
 import argparse
-import json
+import asyncio
+import hashlib
+import random
+import re
+import sqlite3
+import textwrap
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import defaultdict
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
 
+import httpx
 import instructor
-from openai import OpenAI, OpenAIError
-from pydantic import BaseModel
+import orjson
+from instructor.exceptions import InstructorRetryException
+from openai import (
+    APIStatusError,
+    APITimeoutError,
+    AsyncOpenAI,
+    OpenAI,
+    OpenAIError,
+    RateLimitError,
+)
+from pydantic import BaseModel, ValidationError
 from tqdm import tqdm
 
-from src.search.config import InstructorConfig, OpenaiConfig
-from src.search.utils import call_llm
+from src.search.config import (
+    AisuiteConfig,
+    InstructorConfig,
+    ModelConfig,
+    OpenaiConfig,
+    PromptConfig,
+)
+from src.search.utils import call_llm, is_transient
+
+
+# Last bracketed list of the response, the answer follows any reasoning
+_KEYWORD_LIST_RE = re.compile(r"\[([^\[\]]*)\](?!.*\[)", re.DOTALL)
+
+
+KEYWORD_RULES = """prioritized as follows: first, provide keywords that represent the research domain (avoiding overly broad terms like "security", "machine learning", "deep learning", "neural networks" etc.), followed by keywords that represent the research problem. The keywords should be concise and accurately capture the research domain and core issues of the provided paper."""
+
+# Prompts are built once, only the paper fields are filled in per request
+_PROMPT_TEMPLATE = textwrap.dedent(
+    """\
+    Title: {title}
+    Abstract: {abstract}
+    Based on the provided paper title and abstract, extract 5 keywords {rules} The output format should be only a list of keywords, just as follows:
+    [keyword1, keyword2, keyword3, keyword4, keyword5]
+
+    EXAMPLE INPUT:
+    Title: "MACE: Detecting Privilege Escalation Vulnerabilities in Web Applications"
+    Abstract: "We explore the problem of identifying unauthorized privilege escalation instances in a web application. These vulnerabilities are typically caused by missing or incorrect authorizations in the server side code of a web application. The problem of identifying these vulnerabilities is compounded by the lack of an access control policy specification in a typical web application, where the only supplied documentation is in fact its source code. This makes it challenging to infer missing checks that protect a web application’s sensitive resources. To address this challenge, we develop a notion of authorization context consistency, which is satisfied when a web application consistently enforces its authorization checks across the code. We then present an approach based on program analysis to check for authorization state consistency in a web application. Our approach is implemented in a tool called MACE that uncovers vulnerabilities that could be exploited in the form of privilege escalation attacks. In particular, MACE is the first tool reported in the literature to identify a new class of web application vulnerabilities called Horizontal Privilege Escalation (HPE) vulnerabilities. MACE works on large codebases, and discovers serious, previously unknown, vulnerabilities in 5 out of 7 web applications tested. Without MACE, a comparable human-driven security audit would require weeks of effort in code inspection and testing."
+
+    EXAMPLE OUTPUT:
+    ["Web Application Security", "Access Control", "Privilege Escalation", "Authorization Vulnerabilities", "Horizontal Privilege Escalation (HPE)"]
+    """
+).format(rules=KEYWORD_RULES, title="{title}", abstract="{abstract}")
+_BATCH_PROMPT_TEMPLATE = (
+    "For each of the {count} numbered papers below, based on its title and "
+    f"abstract, extract 5 keywords {KEYWORD_RULES}\n"
+    "The output format should be only a JSON array holding one list of "
+    "keywords per paper, in the order of the papers, just as follows:\n"
+    '[["keyword1", "keyword2", "keyword3", "keyword4", "keyword5"], '
+    '["keyword1", "keyword2", "keyword3", "keyword4", "keyword5"]]\n\n'
+    "{papers}"
+)
+
+# Five keywords fit well within this many output tokens per paper
+KEYWORD_MAX_TOKENS = 128
+KEYWORD_REQUEST_TIMEOUT = 20
+
+# Requests allowed in one Batch API job and the job states that are final
+BATCH_API_MAX_REQUESTS = 50_000
+BATCH_API_FINAL_STATES = ("completed", "failed", "expired", "cancelled")
+BATCH_API_POLL_INTERVAL = 30
 
 
 class Keywords(BaseModel):
     keywords: list[str]
 
 
+class KeywordsBatch(BaseModel):
+    items: list[Keywords]
+
+
+def _parse_keywords(response: str | None) -> list[str] | None:
+    """Parse the [keyword1, keyword2, ...] list the prompt asks for"""
+    match = _KEYWORD_LIST_RE.search(response or "")
+    if match is None:
+        return None
+
+    try:
+        keywords = orjson.loads(match.group(0))
+    except orjson.JSONDecodeError:
+        # Unquoted items, e.g. [Web Security, Access Control]
+        keywords = match.group(1).split(",")
+    if not isinstance(keywords, list):
+        return None
+
+    keywords = [str(k).strip().strip("\"'").strip() for k in keywords]
+    keywords = [k for k in keywords if k]
+    return keywords or None
+
+
+def _parse_keyword_batch(response: str | None) -> list[list[str]] | None:
+    """Parse the JSON array of keyword lists of a batched request"""
+    start = (response or "").find("[")
+    end = (response or "").rfind("]")
+    if start == -1 or end < start:
+        return None
+    try:
+        lists = orjson.loads(response[start : end + 1])
+    except orjson.JSONDecodeError:
+        return None
+    if not isinstance(lists, list) or not all(
+        isinstance(item, list) for item in lists
+    ):
+        return None
+    return [[str(k).strip() for k in item if str(k).strip()] for item in lists]
+
+
+def _truncate_abstract(abstract: str | None) -> str:
+    """Cut an abstract to the prompt budget, its opening is enough"""
+    return (abstract or "")[: PromptConfig.max_abstract_chars]
+
+
+def _retry_after(error: RateLimitError) -> float:
+    """Seconds the server asked to wait before retrying, 0 if not given"""
+    try:
+        return max(0.0, float(error.response.headers.get("retry-after", 0)))
+    except (AttributeError, TypeError, ValueError):
+        return 0.0
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD limit on concurrent LLM requests
+
+    The limit grows by one half request per window of fast responses and is
+    halved on rate limiting, overload errors or latency spikes, which keeps
+    the requests in flight close to what the provider can currently serve.
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        minimum: int = 1,
+        maximum: int = 64,
+        target_latency: float = 10.0,
+        window: int = 20,
+    ):
+        """
+        Initialize the controller
+
+        Args:
+            initial: Concurrency to start with
+            minimum: Lowest concurrency the limit can shrink to
+            maximum: Highest concurrency the limit can grow to
+            target_latency: Mean seconds per request below which the limit
+                grows, twice this value counts as a spike
+            window: Number of latency samples per adjustment
+        """
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = float(min(max(initial, minimum), maximum))
+        self.target_latency = target_latency
+        self.window = window
+        self._latencies: list[float] = []
+        self._in_flight = 0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        """Wait until another request may be sent"""
+        async with self._condition:
+            await self._condition.wait_for(
+                lambda: self._in_flight < int(self.limit)
+            )
+            self._in_flight += 1
+
+    async def release(self, latency: float) -> None:
+        """Mark a request as done and adjust the limit from its latency"""
+        async with self._condition:
+            self._in_flight -= 1
+            self._latencies.append(latency)
+            if len(self._latencies) >= self.window:
+                mean = sum(self._latencies) / len(self._latencies)
+                self._latencies.clear()
+                if mean > 2 * self.target_latency:
+                    self._decrease()
+                elif mean <= self.target_latency:
+                    self.limit = min(self.maximum, self.limit + 0.5)
+            self._condition.notify_all()
+
+    def backoff(self) -> None:
+        """Halve the limit after the provider signalled overload"""
+        self._decrease()
+        self._latencies.clear()
+
+    def _decrease(self) -> None:
+        self.limit = max(self.minimum, self.limit / 2)
+
+
+def _is_overload(error: OpenAIError) -> bool:
+    """Whether an error means the provider wants fewer requests"""
+    if isinstance(error, (RateLimitError, APITimeoutError)):
+        return True
+    return isinstance(error, APIStatusError) and error.status_code in (
+        502,
+        503,
+        504,
+    )
+
+
+class KeywordCache:
+    """SQLite store of extracted keywords keyed by paper content and model"""
+
+    def __init__(self, db_path: Path):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS kw ("
+            "hash BLOB PRIMARY KEY, keywords TEXT, model TEXT)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def paper_key(title: str, abstract: str) -> bytes:
+        # The model is part of the key so switching models starts over
+        text = f"{title}\x00{abstract}\x00{AisuiteConfig.model_name}"
+        return hashlib.sha256(text.encode()).digest()
+
+    def get_many(self, keys: list[bytes]) -> dict[bytes, list[str]]:
+        """Return the cached keywords found for the given papers"""
+        found = {}
+        # Stay below SQLite's limit on query parameters
+        for start in range(0, len(keys), 500):
+            chunk = keys[start : start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT hash, keywords FROM kw "
+                    f"WHERE hash IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+            found.update((key, orjson.loads(kw)) for key, kw in rows)
+        return found
+
+    def set_many(self, results: dict[bytes, list[str]]) -> None:
+        """Store the keywords of several papers in one transaction"""
+        if not results:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO kw (hash, keywords, model) "
+                "VALUES (?, ?, ?)",
+                [
+                    (key, orjson.dumps(keywords), AisuiteConfig.model_name)
+                    for key, keywords in results.items()
+                ],
+            )
+            self._conn.commit()
+
+
+def _paper_key(paper: dict[str, Any]) -> bytes:
+    info = paper["info"]
+    return KeywordCache.paper_key(
+        info.get("title", ""), info.get("abstract", "")
+    )
+
+
+class YearProgress:
+    """Papers of one conference year and their extraction progress"""
+
+    def __init__(
+        self,
+        conf: str,
+        year: str,
+        input_file: Path,
+        papers: list[dict[str, Any]],
+        pending: list[dict[str, Any]],
+        partial_file: BinaryIO | None,
+    ):
+        self.conf = conf
+        self.year = year
+        self.input_file = input_file
+        self.papers = papers
+        self.pending = pending
+        self.partial_file = partial_file
+        self.remaining = len(pending)
+
+    def record(self, paper: dict[str, Any], keywords: list[str]) -> None:
+        """Store the keywords of a paper and append them to the partial log"""
+        paper["info"]["keywords"] = keywords
+        if self.partial_file is not None:
+            paper_id = paper["info"].get("title", "")
+            self.partial_file.write(
+                orjson.dumps({"id": paper_id, "keywords": keywords}) + b"\n"
+            )
+            self.partial_file.flush()
+
+
 class KeywordExtractor:
     def __init__(
         self,
         enriched_dir: str = "data/enriched",
         cache_dir: str = "data/cache/keywords",
         max_workers: int = 5,
+        batch_size: int = 5,
     ):
         self.enriched_dir = Path(enriched_dir)
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Starting concurrency, adapted to the provider during a run
         self.max_workers = max_workers
+        # Papers sharing one LLM request
+        self.batch_size = batch_size
+        self._concurrency: AdaptiveConcurrency | None = None
+        # Survives lost partial files and reruns on overlapping papers
+        self.keyword_cache = KeywordCache(self.cache_dir / "kw_cache.sqlite")
+
+    def _create_client(self) -> AsyncOpenAI:
+        """Create the client shared by all requests of one run"""
+        # Retries are handled by _extract_keywords
+        return AsyncOpenAI(
+            base_url=OpenaiConfig.base_url,
+            api_key=OpenaiConfig.api_key,
+            max_retries=0,
+            timeout=KEYWORD_REQUEST_TIMEOUT,
+            # HTTP/2 multiplexes concurrent requests over one connection
+            http_client=httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(
+                    max_connections=self.max_workers * 2,
+                    max_keepalive_connections=self.max_workers,
+                ),
+            ),
+        )
+
+    def _build_prompt(self, title: str, abstract: str) -> str:
+        """Prompt asking for the keywords of one paper"""
+        return _PROMPT_TEMPLATE.format(
+            title=title, abstract=_truncate_abstract(abstract)
+        )
 
-    def _extract_keywords(
-        self, title: str, abstract: str, max_retries: int = 3
+    async def _extract_keywords(
+        self,
+        client: instructor.AsyncInstructor,
+        title: str,
+        abstract: str,
+        max_retries: int = 6,
     ) -> Keywords | None:
         """Extract keywords from paper title and abstract using LLM"""
-        prompt = f"""
-                    Title: {title}
-                    Abstract: {abstract}
-                    Based on the provided paper title and abstract, extract 5 keywords prioritized as follows: first, provide keywords that represent the research domain (avoiding overly broad terms like "security", "machine learning", "deep learning", "neural networks" etc.), followed by keywords that represent the research problem. The keywords should be concise and accurately capture the research domain and core issues of the provided paper. The output format should be only a list of keywords, just as follows:
-                    [keyword1, keyword2, keyword3, keyword4, keyword5]
-
-                    EXAMPLE INPUT: 
-                    Title: "MACE: Detecting Privilege Escalation Vulnerabilities in Web Applications"
-                    Abstract: "We explore the problem of identifying unauthorized privilege escalation instances in a web application. These vulnerabilities are typically caused by missing or incorrect authorizations in the server side code of a web application. The problem of identifying these vulnerabilities is compounded by the lack of an access control policy specification in a typical web application, where the only supplied documentation is in fact its source code. This makes it challenging to infer missing checks that protect a web application’s sensitive resources. To address this challenge, we develop a notion of authorization context consistency, which is satisfied when a web application consistently enforces its authorization checks across the code. We then present an approach based on program analysis to check for authorization state consistency in a web application. Our approach is implemented in a tool called MACE that uncovers vulnerabilities that could be exploited in the form of privilege escalation attacks. In particular, MACE is the first tool reported in the literature to identify a new class of web application vulnerabilities called Horizontal Privilege Escalation (HPE) vulnerabilities. MACE works on large codebases, and discovers serious, previously unknown, vulnerabilities in 5 out of 7 web applications tested. Without MACE, a comparable human-driven security audit would require weeks of effort in code inspection and testing."
- 
-                    EXAMPLE OUTPUT:
-                    ["Web Application Security", "Access Control", "Privilege Escalation", "Authorization Vulnerabilities", "Horizontal Privilege Escalation (HPE)"]
-                    """
-
+        prompt = self._build_prompt(title, abstract)
         messages = [{"role": "user", "content": prompt}]
+        response = await self._complete(
+            messages, max_retries, max_tokens=KEYWORD_MAX_TOKENS
+        )
+        if response is None:
+            return None
+
+        keywords = _parse_keywords(response)
+        if keywords is not None:
+            return Keywords(keywords=keywords)
+
+        # Only answers that ignore the list format need a second call
+        try:
+            return await client.chat.completions.create(
+                model=InstructorConfig.model_name,
+                response_model=Keywords,
+                messages=[{"role": "user", "content": response}],
+            )
+        except (ValidationError, InstructorRetryException) as e:
+            print(f"Could not parse keywords from response: {str(e)}")
+            return None
+        except Exception as e:
+            print(f"Unexpected error extracting keywords: {str(e)}")
+            return None
+
+    async def _extract_keywords_batch(
+        self,
+        client: instructor.AsyncInstructor,
+        papers: list[tuple[str, str]],
+        max_retries: int = 6,
+    ) -> list[Keywords | None]:
+        """
+        Extract keywords for several papers with one LLM request
 
-        client = instructor.from_openai(
-            OpenAI(base_url=OpenaiConfig.base_url, api_key=OpenaiConfig.api_key)
+        Args:
+            client: Instructor client of the current run
+            papers: (title, abstract) of each paper
+            max_retries: Attempts for the batched request
+
+        Returns:
+            Keywords of each paper in order, None where extraction failed
+        """
+        if len(papers) == 1:
+            return [await self._extract_keywords(client, *papers[0])]
+
+        numbered = "\n\n".join(
+            f"Paper {i}:\nTitle: {title}\n"
+            f"Abstract: {_truncate_abstract(abstract)}"
+            for i, (title, abstract) in enumerate(papers, 1)
+        )
+        prompt = _BATCH_PROMPT_TEMPLATE.format(
+            count=len(papers), papers=numbered
         )
 
-        for attempt in range(max_retries):
+        messages = [{"role": "user", "content": prompt}]
+        response = await self._complete(
+            messages, max_retries, max_tokens=KEYWORD_MAX_TOKENS * len(papers)
+        )
+        if response is None:
+            return [None] * len(papers)
+
+        keyword_lists = _parse_keyword_batch(response)
+        if keyword_lists is None:
             try:
-                response = call_llm(messages=messages)
-                keywords = client.chat.completions.create(
+                batch = await client.chat.completions.create(
                     model=InstructorConfig.model_name,
-                    response_model=Keywords,
+                    response_model=KeywordsBatch,
                     messages=[{"role": "user", "content": response}],
                 )
-                return keywords
+                keyword_lists = [item.keywords for item in batch.items]
+            except (ValidationError, InstructorRetryException) as e:
+                print(f"Could not parse keywords from response: {str(e)}")
+            except Exception as e:
+                print(f"Unexpected error extracting keywords: {str(e)}")
+
+        if keyword_lists is None or len(keyword_lists) != len(papers):
+            # Fall back to one request per paper rather than guess which
+            # answer belongs to which paper
+            return list(
+                await asyncio.gather(
+                    *(
+                        self._extract_keywords(client, title, abstract)
+                        for title, abstract in papers
+                    )
+                )
+            )
+        return [
+            Keywords(keywords=keywords) if keywords else None
+            for keywords in keyword_lists
+        ]
+
+    async def _complete(
+        self, messages: list[dict[str, str]], max_retries: int, max_tokens: int
+    ) -> str | None:
+        """Send a prompt through call_llm, retrying API errors"""
+        for attempt in range(max_retries):
+            try:
+                await self._concurrency.acquire()
+                start = time.monotonic()
+                try:
+                    # aisuite has no async client, run it off the event loop
+                    return await asyncio.to_thread(
+                        call_llm, messages=messages, max_tokens=max_tokens
+                    )
+                finally:
+                    await self._concurrency.release(time.monotonic() - start)
             except OpenAIError as e:
+                if not is_transient(e):
+                    print(f"Request rejected, not retrying: {str(e)}")
+                    return None
+                if _is_overload(e):
+                    self._concurrency.backoff()
                 if attempt < max_retries - 1:
-                    wait_time = (attempt + 1) * 2
+                    # Exponential backoff with jitter keeps concurrent
+                    # requests from retrying in lock-step
+                    wait_time = min(60, 2**attempt) + random.random()
+                    if isinstance(e, RateLimitError):
+                        wait_time = max(wait_time, _retry_after(e))
                     print(
-                        f"OpenAI API error: {str(e)}. Retrying in {wait_time}s..."
+                        f"OpenAI API error: {str(e)}. Retrying in {wait_time:.1f}s..."
                     )
-                    time.sleep(wait_time)
+                    await asyncio.sleep(wait_time)
                 else:
                     print(
                         f"Failed to extract keywords after {max_retries} attempts: {str(e)}"
@@ -83,11 +490,87 @@ class KeywordExtractor:
         """Generate cache file path for the conference and year"""
         return self.cache_dir / f"{conference}_{year}_keywords.json"
 
+    def _load_year(
+        self, conf: str, year: str, save_partial: bool
+    ) -> YearProgress | None:
+        """Load the papers of a year and replay its partial results"""
+        input_file = self.enriched_dir / conf / f"{year}.json"
+        if not input_file.exists():
+            return None
+
+        cache_path = self._get_cache_path(conf, year)
+        # One {"id", "keywords"} line is appended per processed paper
+        partial_path = cache_path.with_suffix(".partial.jsonl")
+
+        # Load data
+        try:
+            papers = orjson.loads(input_file.read_bytes())
+        except Exception as e:
+            print(f"Error loading {input_file}: {e}")
+            return None
+
+        # Load processed papers from partial results if they exist
+        processed_papers = set()
+        torn_line = False
+        if save_partial and partial_path.exists():
+            try:
+                by_title = defaultdict(list)
+                for paper in papers:
+                    by_title[paper["info"].get("title", "")].append(paper)
+                with open(partial_path, "rb") as f:
+                    for line in f:
+                        torn_line = not line.endswith(b"\n")
+                        try:
+                            entry = orjson.loads(line)
+                        except orjson.JSONDecodeError:
+                            # Line cut short by an interrupted run
+                            continue
+                        paper_id = entry["id"]
+                        keywords = entry["keywords"]
+                        for paper in by_title.get(paper_id, []):
+                            paper["info"]["keywords"] = keywords
+                        processed_papers.add(paper_id)
+                print(
+                    f"Loaded {len(processed_papers)} processed papers from "
+                    f"partial results of {conf} {year}"
+                )
+            except Exception as e:
+                print(f"Error loading partial results: {str(e)}")
+
+        partial_file = None
+        if save_partial:
+            partial_file = open(partial_path, "ab")
+            # Start on a fresh line after a line cut short
+            if torn_line:
+                partial_file.write(b"\n")
+
+        pending = [
+            paper
+            for paper in papers
+            if paper["info"].get("title", "") not in processed_papers
+            and paper["info"].get("type") != "Editorship"
+        ]
+        return YearProgress(
+            conf, year, input_file, papers, pending, partial_file
+        )
+
+    def _finish_year(self, progress: YearProgress) -> None:
+        """Write the papers of a year back once all of them are done"""
+        if progress.partial_file is not None:
+            progress.partial_file.close()
+            progress.partial_file = None
+
+        progress.input_file.write_bytes(
+            orjson.dumps(progress.papers, option=orjson.OPT_INDENT_2)
+        )
+        print(f"Completed processing {progress.conf} {progress.year}")
+
     def process_papers(
         self,
         conference: str | None = None,
         year: str | None = None,
         save_partial: bool = True,
+        use_batch_api: bool = False,
     ) -> None:
         """
         Process papers and extract keywords
@@ -96,6 +579,8 @@ class KeywordExtractor:
             conference: Optional conference to process
             year: Optional year to process
             save_partial: Whether to save partial results periodically
+            use_batch_api: Whether to submit all papers as one OpenAI batch
+                job instead of sending requests directly
         """
         # Load and filter papers
         conferences = (
@@ -104,6 +589,7 @@ class KeywordExtractor:
             else [d.name for d in self.enriched_dir.iterdir() if d.is_dir()]
         )
 
+        years_to_process = []
         for conf in conferences:
             conf_dir = self.enriched_dir / conf
             if not conf_dir.is_dir():
@@ -112,113 +598,217 @@ class KeywordExtractor:
             years = (
                 [year] if year else [f.stem for f in conf_dir.glob("*.json")]
             )
+            years_to_process.extend((conf, y) for y in years)
 
-            for year in years:
-                input_file = conf_dir / f"{year}.json"
-                if not input_file.exists():
-                    continue
-
-                print(f"\nProcessing {conf} {year}...")
-                cache_path = self._get_cache_path(conf, year)
-                partial_path = cache_path.with_suffix(".partial.json")
+        if use_batch_api:
+            try:
+                self._process_years_batch_api(years_to_process, save_partial)
+                return
+            except OpenAIError as e:
+                print(f"Batch API unavailable, sending requests directly: {e}")
+
+        asyncio.run(self._process_years(years_to_process, save_partial))
+
+    def _load_years(
+        self, years: list[tuple[str, str]], save_partial: bool
+    ) -> list[YearProgress]:
+        """Load the years that still have papers to process"""
+        progresses = []
+        for conf, year in years:
+            progress = self._load_year(conf, year, save_partial)
+            if progress is None:
+                continue
 
-                # Load data
-                try:
-                    with open(input_file) as f:
-                        papers = json.load(f)
-                        papers_count = len(papers)
-                except Exception as e:
-                    print(f"Error loading {input_file}: {e}")
-                    continue
+            # Papers extracted before, by any run, skip the LLM
+            cached = self.keyword_cache.get_many(
+                [_paper_key(paper) for paper in progress.pending]
+            )
+            if cached:
+                pending = []
+                for paper in progress.pending:
+                    keywords = cached.get(_paper_key(paper))
+                    if keywords is None:
+                        pending.append(paper)
+                    else:
+                        progress.record(paper, keywords)
+                progress.pending = pending
+                progress.remaining = len(pending)
+
+            if progress.remaining:
+                progresses.append(progress)
+            else:
+                self._finish_year(progress)
+        return progresses
+
+    def _process_years_batch_api(
+        self, years: list[tuple[str, str]], save_partial: bool
+    ) -> None:
+        """
+        Extract keywords through the OpenAI Batch API
 
-                # Load processed papers from partial results if they exist
-                processed_papers = set()
-                if save_partial and partial_path.exists():
-                    try:
-                        with open(partial_path) as f:
-                            partial_data = json.load(f)
-                            processed_papers = set(partial_data["processed"])
-                        print(
-                            f"Loaded {len(processed_papers)} processed papers from partial results"
+        Every pending paper becomes one request of a batch job, results are
+        merged back once the job is done. Jobs run at a lower price and
+        outside the synchronous rate limits, at the cost of latency.
+        """
+        client = OpenAI(
+            base_url=OpenaiConfig.base_url, api_key=OpenaiConfig.api_key
+        )
+        # Fail before loading any data if the endpoint has no Batch API
+        client.batches.list(limit=1)
+
+        progresses = self._load_years(years, save_partial)
+        if not progresses:
+            return
+
+        # The aisuite model name carries a provider prefix
+        model = AisuiteConfig.model_name.split(":", 1)[-1]
+        by_custom_id = {
+            f"{progress.conf}/{progress.year}/{i}": (progress, paper)
+            for progress in progresses
+            for i, paper in enumerate(progress.pending)
+        }
+        custom_ids = list(by_custom_id)
+
+        batch_ids = []
+        try:
+            for start in range(0, len(custom_ids), BATCH_API_MAX_REQUESTS):
+                lines = []
+                for custom_id in custom_ids[
+                    start : start + BATCH_API_MAX_REQUESTS
+                ]:
+                    info = by_custom_id[custom_id][1]["info"]
+                    prompt = self._build_prompt(
+                        info.get("title", ""), info.get("abstract", "")
+                    )
+                    lines.append(
+                        orjson.dumps(
+                            {
+                                "custom_id": custom_id,
+                                "method": "POST",
+                                "url": "/v1/chat/completions",
+                                "body": {
+                                    "model": model,
+                                    "messages": [
+                                        {"role": "user", "content": prompt}
+                                    ],
+                                    "temperature": ModelConfig.temperature,
+                                    "max_tokens": KEYWORD_MAX_TOKENS,
+                                },
+                            }
                         )
-                    except Exception as e:
-                        print(f"Error loading partial results: {str(e)}")
-
-                def process_paper(
-                    paper: dict[str, Any],
-                ) -> tuple[str, list[str]] | None:
-                    paper_id = paper["info"].get("title", "")
-                    if (
-                        paper_id in processed_papers
-                        or paper["info"].get("type") == "Editorship"
-                    ):
-                        return None
-
-                    title = paper["info"].get("title", "")
-                    abstract = paper["info"].get("abstract", "")
+                    )
+                input_file = client.files.create(
+                    file=("keywords.jsonl", b"\n".join(lines)),
+                    purpose="batch",
+                )
+                batch = client.batches.create(
+                    input_file_id=input_file.id,
+                    endpoint="/v1/chat/completions",
+                    completion_window="24h",
+                )
+                batch_ids.append(batch.id)
+                print(f"Submitted batch {batch.id} with {len(lines)} papers")
+
+            for batch_id in batch_ids:
+                batch = client.batches.retrieve(batch_id)
+                while batch.status not in BATCH_API_FINAL_STATES:
+                    time.sleep(BATCH_API_POLL_INTERVAL)
+                    batch = client.batches.retrieve(batch_id)
+                if batch.status != "completed" or not batch.output_file_id:
+                    print(f"Batch {batch_id} ended as {batch.status}")
+                    continue
 
+                output = client.files.content(batch.output_file_id).content
+                extracted = {}
+                for line in output.splitlines():
+                    entry = orjson.loads(line)
+                    progress, paper = by_custom_id[entry["custom_id"]]
                     try:
-                        result = self._extract_keywords(title, abstract)
+                        body = entry["response"]["body"]
+                        response = body["choices"][0]["message"]["content"]
+                    except (KeyError, IndexError, TypeError):
+                        continue
+                    keywords = _parse_keywords(response)
+                    if keywords is not None:
+                        progress.record(paper, keywords)
+                        extracted[_paper_key(paper)] = keywords
+                self.keyword_cache.set_many(extracted)
+        finally:
+            # Papers without results are retried on the next run
+            for progress in progresses:
+                self._finish_year(progress)
+
+    async def _process_years(
+        self, years: list[tuple[str, str]], save_partial: bool
+    ) -> None:
+        """Extract keywords for all years on one event loop"""
+        progresses = self._load_years(years, save_partial)
+        if not progresses:
+            return
+
+        openai_client = self._create_client()
+        client = instructor.from_openai(openai_client)
+        # Bounds the requests in flight across all years, the bound follows
+        # the provider's latency and errors
+        self._concurrency = AdaptiveConcurrency(self.max_workers)
+
+        async def process_batch(
+            progress: YearProgress, batch: list[dict[str, Any]]
+        ) -> tuple[YearProgress, list[dict[str, Any]], list[Keywords | None]]:
+            papers = [
+                (p["info"].get("title", ""), p["info"].get("abstract", ""))
+                for p in batch
+            ]
+            try:
+                results = await self._extract_keywords_batch(client, papers)
+            except Exception as e:
+                print(f"Error processing batch: {str(e)}")
+                results = [None] * len(batch)
+            return progress, batch, results
+
+        # Batches never span years so results map back to one year file
+        tasks = [
+            asyncio.create_task(
+                process_batch(
+                    progress, progress.pending[i : i + self.batch_size]
+                )
+            )
+            for progress in progresses
+            for i in range(0, len(progress.pending), self.batch_size)
+        ]
+        writes = []
+        try:
+            with tqdm(
+                total=sum(p.remaining for p in progresses),
+                desc="Extracting keywords",
+            ) as pbar:
+                for task in asyncio.as_completed(tasks):
+                    progress, batch, results = await task
+                    extracted = {}
+                    for paper, result in zip(batch, results):
                         if result:
                             print(result.keywords)
-                            return paper_id, result.keywords
-                    except Exception as e:
-                        print(f"Error processing paper {title}: {str(e)}")
-                    return None
-
-                save_interval = 5
-                with ThreadPoolExecutor(
-                    max_workers=self.max_workers
-                ) as executor:
-                    future_to_paper = {
-                        executor.submit(process_paper, paper): paper
-                        for paper in papers
-                    }
-
-                    with tqdm(
-                        total=len(papers), desc="Extracting keywords"
-                    ) as pbar:
-                        completed = 0
-                        for future in as_completed(future_to_paper):
-                            paper = future_to_paper[future]
-                            try:
-                                result = future.result()
-                                if result:
-                                    paper_id, keywords = result
-                                    # Update paper with keywords
-                                    for p in papers:
-                                        if p["info"].get("title") == paper_id:
-                                            p["info"]["keywords"] = keywords
-                                            break
-                                    processed_papers.add(paper_id)
-
-                                # Save partial results periodically
-                                completed += 1
-                                if (
-                                    save_partial
-                                    and completed % save_interval == 0
-                                ):
-                                    # Save updated papers
-                                    with open(input_file, "w") as f:
-                                        json.dump(papers, f, indent=4)
-                                    # Save partial progress
-                                    partial_data = {
-                                        "processed": list(processed_papers),
-                                        "papers": papers,
-                                    }
-                                    with open(partial_path, "w") as f:
-                                        json.dump(partial_data, f, indent=4)
-                            except Exception as e:
-                                print(f"Error processing future: {str(e)}")
-                            pbar.update(1)
-
-                with open(input_file, "w") as f:
-                    json.dump(papers, f, indent=4)
-
-                # if save_partial and partial_path.exists():
-                #     partial_path.unlink()  # Remove partial results file
-
-                print(f"Completed processing {conf} {year}")
+                            progress.record(paper, result.keywords)
+                            extracted[_paper_key(paper)] = result.keywords
+                    self.keyword_cache.set_many(extracted)
+                    progress.remaining -= len(batch)
+                    pbar.update(len(batch))
+
+                    # A finished year is written on a worker thread so the
+                    # collector keeps draining results of the other years
+                    if not progress.remaining:
+                        writes.append(
+                            asyncio.create_task(
+                                asyncio.to_thread(self._finish_year, progress)
+                            )
+                        )
+        finally:
+            await openai_client.close()
+            await asyncio.gather(*writes)
+            # Years left unfinished by an interrupted run keep their results
+            for progress in progresses:
+                if progress.remaining:
+                    self._finish_year(progress)
 
 
 def main():
@@ -238,7 +828,18 @@ def main():
         "--max-workers",
         type=int,
         default=10,
-        help="Maximum number of concurrent threads",
+        help="Initial number of concurrent requests, adapted during the run",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=5,
+        help="Number of papers sharing one LLM request",
+    )
+    parser.add_argument(
+        "--use-batch-api",
+        action="store_true",
+        help="Submit all papers as an OpenAI batch job (cheaper, slower)",
     )
     parser.add_argument(
         "--save-partial",
@@ -248,11 +849,14 @@ def main():
 
     args = parser.parse_args()
 
-    extractor = KeywordExtractor(max_workers=args.max_workers)
+    extractor = KeywordExtractor(
+        max_workers=args.max_workers, batch_size=args.batch_size
+    )
     extractor.process_papers(
         conference=args.conference,
         year=args.year,
         save_partial=args.save_partial,
+        use_batch_api=args.use_batch_api,
     )
 
 
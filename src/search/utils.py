@@ -1,26 +1,130 @@
+import threading
+import time
+from collections import deque
 from typing import Any
 
 import aisuite as ai
+import httpx
+from openai import (
+    APIConnectionError,
+    APIStatusError,
+    OpenAIError,
+    RateLimitError,
+)
 
-from src.search.config import AisuiteConfig, ModelConfig, OpenaiConfig
+from src.search.config import (
+    AisuiteConfig,
+    ModelConfig,
+    OpenaiConfig,
+    RateLimitConfig,
+)
+
+
+class RateLimiter:
+    """Thread-safe sliding window limit on requests and tokens per minute"""
+
+    WINDOW = 60.0
+
+    def __init__(self, rpm: int, tpm: int):
+        """
+        Initialize the limiter
+
+        Args:
+            rpm: Requests allowed in any 60 second window
+            tpm: Estimated tokens allowed in any 60 second window
+        """
+        self.rpm = rpm
+        self.tpm = tpm
+        self._lock = threading.Lock()
+        # (time sent, estimated tokens) of the requests in the window
+        self._sent: deque[tuple[float, int]] = deque()
+        self._tokens = 0
+
+    def acquire(self, tokens: int) -> None:
+        """Block until a request of about this many tokens may be sent"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._sent and self._sent[0][0] <= now - self.WINDOW:
+                    self._tokens -= self._sent.popleft()[1]
+
+                # A request larger than the whole budget goes out alone
+                if not self._sent or (
+                    len(self._sent) < self.rpm
+                    and self._tokens + tokens <= self.tpm
+                ):
+                    self._sent.append((now, tokens))
+                    self._tokens += tokens
+                    return
+                wait = self._sent[0][0] + self.WINDOW - now
+            time.sleep(wait)
+
+
+# Shared by every caller so the limits hold across threads
+limiter = RateLimiter(
+    RateLimitConfig.requests_per_minute, RateLimitConfig.tokens_per_minute
+)
+
+
+def is_transient(error: OpenAIError) -> bool:
+    """Whether a failed request may succeed when sent again"""
+    if isinstance(error, (APIConnectionError, RateLimitError)):
+        return True
+    # Other 4xx responses reject the request itself, retrying cannot help
+    return isinstance(error, APIStatusError) and (
+        error.status_code >= 500 or error.status_code in (408, 409)
+    )
+
+
+def estimate_tokens(messages: list[dict[str, Any]]) -> int:
+    """Rough token count of a prompt, about four characters per token"""
+    return sum(len(str(m.get("content", ""))) for m in messages) // 4 + 1
+
+
+_DEFAULT_PARAMS = {
+    k: getattr(ModelConfig, k) for k in ModelConfig.__annotations__
+}
+
+_client_lock = threading.Lock()
+_client: ai.Client | None = None
+
+
+def _get_client() -> ai.Client:
+    """Return the aisuite client shared by all calls"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = ai.Client(
+                    provider_configs={
+                        "openai": {
+                            "base_url": OpenaiConfig.base_url,
+                            "api_key": OpenaiConfig.api_key,
+                            # Worker threads share one HTTP/2 connection
+                            "http_client": httpx.Client(
+                                http2=True,
+                                limits=httpx.Limits(
+                                    max_connections=100,
+                                    max_keepalive_connections=32,
+                                ),
+                            ),
+                            "timeout": 30,
+                            # Callers own retries and their backoff
+                            "max_retries": 0,
+                        },
+                    }
+                )
+    return _client
 
 
 def call_llm(
     messages: list[dict[str, Any]] = [],
     **kwargs,
 ):
-    provider_configs = {
-        "openai": {
-            "base_url": OpenaiConfig.base_url,
-            "api_key": OpenaiConfig.api_key,
-        },
-    }
-    client = ai.Client(provider_configs=provider_configs)
-
-    params = {k: getattr(ModelConfig, k) for k in ModelConfig.__annotations__}
-    params.update(kwargs)
-
-    response = client.chat.completions.create(
+    params = {**_DEFAULT_PARAMS, **kwargs}
+
+    limiter.acquire(estimate_tokens(messages))
+    response = _get_client().chat.completions.create(
         model=AisuiteConfig.model_name,
         messages=messages,
         **params,